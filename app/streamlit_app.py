@@ -1,7 +1,7 @@
 # Import packages
 import streamlit as st
-import pandas as pd
 import sys
+import uuid
 import os
 from pathlib import Path
 
@@ -15,6 +15,8 @@ from tab_df.display import display_tab_df_content
 from tab_num.display import display_tab_num_content
 from tab_text.display import display_tab_text_content
 from tab_date.display import display_tab_date_content
+from tab_ts.display import display_tab_ts_content
+from utils.loader import is_excel, list_sheets, load_dataframe
 
 # Set Streamlit Page Configuration
 st.set_page_config(
@@ -25,7 +27,10 @@ st.set_page_config(
 )
 
 # Set objects in Streamlit session state
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = uuid.uuid4().hex
 st.session_state["file_path"] = None
+st.session_state["sheet_name"] = None
 st.session_state["df"] = None
 st.session_state["dataset"] = None
 st.session_state["selected_num_col"] = None
@@ -40,7 +45,7 @@ st.title("CSV Explorer")
 
 # Add Window to upload CSV file
 with st.expander("ℹ️ - Streamlit application for performing data exploration on a CSV", expanded=True):
-    uploaded_file = st.file_uploader("Choose a CSV file")
+    uploaded_file = st.file_uploader("Choose a CSV or Excel file")
     # st.session_state.file_path = st.file_uploader("Choose a CSV file")
     # print(st.session_state.file_path)
 
@@ -55,22 +60,28 @@ if uploaded_file is not None:
     with open(file_path, "wb") as f:
         f.write(uploaded_file.read())
 
-    tab_df, tab_num, tab_text, tab_date = st.tabs(["DataFrame", "Numeric Serie", "Text Serie", "Datetime Serie"])
+    if is_excel(file_path):
+        sheets = list_sheets(file_path)
+        if len(sheets) > 1:
+            st.session_state.sheet_name = st.selectbox("Select a sheet", sheets)
+        elif sheets:
+            st.session_state.sheet_name = sheets[0]
+
+    tab_df, tab_num, tab_text, tab_date, tab_ts = st.tabs(["DataFrame", "Numeric Serie", "Text Serie", "Datetime Serie", "Time Serie"])
     st.session_state.file_path = file_path
     try:
-        st.session_state["df"] = pd.read_csv(file_path)
-    except UnicodeDecodeError:
-        try:
-            st.session_state["df"] = pd.read_csv(file_path,encoding = "ISO-8859-1")
-        except Exception as e:
-            print(e)
-            # st.error("Unable to pass CSV file are you sure you are using CSV format file")
+        st.session_state["df"] = load_dataframe(file_path, sheet_name=st.session_state.sheet_name)
+    except Exception as e:
+        print(e)
+        # st.error("Unable to pass CSV file are you sure you are using CSV format file")
 
     with tab_df:
-        display_tab_df_content(file_path=st.session_state.file_path)
+        display_tab_df_content(file_path=st.session_state.file_path, sheet_name=st.session_state.sheet_name)
     with tab_num:
-        display_tab_num_content(file_path=st.session_state.file_path,df=st.session_state["df"])
+        display_tab_num_content(file_path=st.session_state.file_path,df=st.session_state["df"],sheet_name=st.session_state.sheet_name)
     with tab_text:
-        display_tab_text_content(st.session_state.file_path,df=st.session_state["df"])
+        display_tab_text_content(st.session_state.file_path,df=st.session_state["df"],sheet_name=st.session_state.sheet_name)
     with tab_date:
-        display_tab_date_content(st.session_state.file_path,df=st.session_state["df"])
\ No newline at end of file
+        display_tab_date_content(st.session_state.file_path,df=st.session_state["df"],sheet_name=st.session_state.sheet_name)
+    with tab_ts:
+        display_tab_ts_content(st.session_state.file_path,df=st.session_state["df"],sheet_name=st.session_state.sheet_name)
\ No newline at end of file
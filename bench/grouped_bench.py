@@ -0,0 +1,60 @@
+# Compare the single-pass grouped profile against filtering and calling
+# set_data once per group.
+#
+#   python bench/grouped_bench.py [n_rows] [n_groups]
+import sys
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(os.path.dirname(__file__)).resolve().parents[0]))
+
+from tab_num.logics import NumericColumn
+
+
+def make_df(n_rows, n_groups, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'group': rng.integers(0, n_groups, n_rows).astype(str).astype(object),
+        'value': rng.normal(size=n_rows),
+    })
+
+
+def per_group(df, n_groups):
+    for label in df['group'].unique()[:n_groups]:
+        numeric_col = NumericColumn(df=df[df['group'] == label])
+        numeric_col.find_num_cols()
+        numeric_col.serie = numeric_col.df['value']
+        for step in (numeric_col.set_missing, numeric_col.set_mean, numeric_col.set_std, numeric_col.set_min,
+                     numeric_col.set_max, numeric_col.set_median, numeric_col.set_zeros, numeric_col.set_negatives):
+            step()
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_groups = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    df = make_df(n_rows, n_groups)
+
+    numeric_col = NumericColumn(df=df)
+    numeric_col.find_num_cols()
+
+    start = time.perf_counter()
+    numeric_col.set_grouped('value', 'group', top_k=20)
+    grouped = time.perf_counter() - start
+
+    # The per-group loop is sampled on a few groups and extrapolated
+    sampled = 50
+    start = time.perf_counter()
+    per_group(df, sampled)
+    loop = (time.perf_counter() - start) / sampled * n_groups
+
+    print(f"rows={n_rows} groups={n_groups}")
+    print(f"grouped aggregation: {grouped:.3f}s")
+    print(f"per-group set_data (extrapolated): {loop:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,385 @@
+# Headless load test of the display layer: N concurrent sessions upload a
+# generated file and browse every tab and column, with Streamlit replaced by
+# a stub that renders nothing but measures what would be sent. Reports the
+# latency percentiles of each interaction, throughput and peak RSS, and
+# compares them with the baseline kept in bench/baselines/load_test.json.
+# Interactions sending more than PAYLOAD_BUDGET_KB fail whatever the baseline.
+#
+# Latencies and throughput depend on the machine, so every run also times a
+# fixed pandas workload and the baseline figures are scaled by the ratio of
+# the two calibration times before comparing. What is left of the machine
+# noise is covered by LATENCY_TOLERANCE (p50 and p95 may be 50% slower) and
+# TOLERANCE (throughput, peak RSS and payload may be 25% worse).
+#
+#   python bench/load_test.py [--sessions 8] [--rows 50000] [--files 4]
+#   python bench/load_test.py --save-baseline
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+sys.path.append(str(Path(os.path.dirname(__file__)).resolve().parents[0]))
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'load_test.json')
+PERCENTILES = (50, 95, 99)
+# Few samples make p99 too noisy to compare, it is only reported
+COMPARED_PERCENTILES = (50, 95)
+TOLERANCE = 0.25
+LATENCY_TOLERANCE = 0.5
+# Largest payload of one interaction, in kilobytes
+PAYLOAD_BUDGET_KB = 1024
+CALIBRATION_ROWS = 1_000_000
+CALIBRATION_REPEATS = 5
+
+
+class SessionState(dict):
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+
+class Session:
+    def __init__(self, session_id):
+        self.state = SessionState(session_id=session_id)
+        self.choices = {}
+        self.sent_bytes = 0
+        self.errors = []
+
+
+def frame_bytes(data):
+    
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        return len(data.to_json(default_handler=str))
+    return len(str(data))
+
+
+class StubStreamlit:
+    # Stands in for the streamlit module, every thread is one session.
+    # Widgets return the session's choice for their label, or their default
+    def __init__(self):
+        self.local = threading.local()
+
+    @property
+    def session(self):
+        return self.local.session
+
+    @property
+    def session_state(self):
+        return self.session.state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def expander(self, *args, **kwargs):
+        return self
+
+    def container(self, *args, **kwargs):
+        return self
+
+    def empty(self, *args, **kwargs):
+        return self
+
+    def selectbox(self, label, options, index=0, **kwargs):
+        options = list(options)
+        choice = self.session.choices.get(label)
+        if choice in options:
+            return choice
+        return options[index] if options else None
+
+    def radio(self, label, options, index=0, **kwargs):
+        return self.selectbox(label, options, index)
+
+    def slider(self, label, min_value=None, max_value=None, value=None, step=None, **kwargs):
+        return self.session.choices.get(label, min_value if value is None else value)
+
+    def checkbox(self, label, value=False, **kwargs):
+        return self.session.choices.get(label, value)
+
+    def altair_chart(self, chart, **kwargs):
+        self.session.sent_bytes += len(chart.to_json(validate=False))
+
+    def table(self, data=None, **kwargs):
+        self.session.sent_bytes += frame_bytes(data)
+
+    def dataframe(self, data=None, **kwargs):
+        self.session.sent_bytes += frame_bytes(data)
+
+    def write(self, *args, **kwargs):
+        self.session.sent_bytes += sum(frame_bytes(arg) for arg in args)
+
+    def caption(self, body, **kwargs):
+        self.session.sent_bytes += len(str(body))
+
+    def info(self, body, **kwargs):
+        self.session.sent_bytes += len(str(body))
+
+    def error(self, body, **kwargs):
+        self.session.errors.append(str(body))
+
+
+# The display modules must import the stub instead of streamlit, which
+# sends charts whatever their number of rows
+stub = sys.modules['streamlit'] = StubStreamlit()
+alt.data_transformers.disable_max_rows()
+
+from tab_date.display import display_tab_date_content  # noqa: E402
+from tab_df.display import display_tab_df_content  # noqa: E402
+from tab_num.display import display_tab_num_content  # noqa: E402
+from tab_text.display import display_tab_text_content  # noqa: E402
+from tab_ts.display import display_tab_ts_content  # noqa: E402
+from utils.cache import clear_cache  # noqa: E402
+from utils.loader import load_dataframe  # noqa: E402
+from utils.store import ResultStore, set_store  # noqa: E402
+
+
+def make_file(file_path, n_rows, seed):
+    
+    rng = np.random.default_rng(seed)
+    price = rng.lognormal(3, 1, n_rows)
+    price[rng.random(n_rows) < 0.02] = np.nan
+    pd.DataFrame({
+        'price': price,
+        'quantity': rng.integers(0, 100, n_rows),
+        'score': rng.normal(size=n_rows).round(3),
+        'store': rng.choice([f'store_{i}' for i in range(50)], n_rows),
+        'order_id': [f'order_{seed}_{i}' for i in range(n_rows)],
+        'day': (pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 1500, n_rows), unit='D'))
+        .strftime('%Y-%m-%d'),
+    }).to_csv(file_path, index=False)
+
+
+def browse(session_id, source_path, upload_dir, timings, sent):
+    
+    session = Session(session_id)
+    stub.local.session = session
+
+    def timed(name, fn):
+        start, sent_bytes = time.perf_counter(), session.sent_bytes
+        fn()
+        timings[name].append(time.perf_counter() - start)
+        sent[name].append(session.sent_bytes - sent_bytes)
+
+    # Uploading copies the file into the upload folder like the app does
+    file_path = os.path.join(upload_dir, f'{session_id}.csv')
+    frame = {}
+    timed('upload', lambda: frame.update(df=load_dataframe(shutil.copyfile(source_path, file_path))))
+    df = frame['df']
+
+    timed('df', lambda: display_tab_df_content(file_path=file_path))
+    tabs = (
+        ('num', 'Select a numeric column', display_tab_num_content, df.select_dtypes('number').columns),
+        ('text', 'Select Text Column', display_tab_text_content, df.select_dtypes('object').columns.drop('day')),
+        ('date', 'Select a datetime column:', display_tab_date_content, ['day']),
+    )
+    for name, label, display, columns in tabs:
+        for col in columns:
+            session.choices = {label: col}
+            timed(name, lambda: display(file_path, df=df))
+    session.choices = {}
+    timed('ts', lambda: display_tab_ts_content(file_path, df=df))
+    return session
+
+
+def peak_rss_mb():
+    
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def calibrate(n_rows=CALIBRATION_ROWS, repeats=CALIBRATION_REPEATS):
+    
+    # A fixed parse, group and sort workload standing for the display layer
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'key': rng.integers(0, 1000, n_rows), 'value': rng.normal(size=n_rows)})
+    text = df.head(n_rows // 10).to_csv(index=False)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        pd.read_csv(io.StringIO(text))
+        df.groupby('key')['value'].agg(['mean', 'std', 'median'])
+        df.sort_values('value')
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+
+def run(n_sessions, n_rows, n_files):
+    
+    calibration_ms = calibrate()
+    temp_dir = tempfile.mkdtemp()
+    try:
+        sources = []
+        for i in range(n_files):
+            sources.append(os.path.join(temp_dir, f'source_{i}.csv'))
+            make_file(sources[-1], n_rows, seed=i)
+        upload_dir = os.path.join(temp_dir, 'csv')
+        os.makedirs(upload_dir)
+
+        # Every run starts cold
+        clear_cache()
+        set_store(ResultStore(os.path.join(upload_dir, '.cache', 'results.sqlite')))
+
+        timings = defaultdict(list)
+        sent = defaultdict(list)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=n_sessions) as pool:
+            futures = [
+                pool.submit(browse, f'session_{i}', sources[i % n_files], upload_dir, timings, sent)
+                for i in range(n_sessions)
+            ]
+            sessions = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+    finally:
+        set_store(None)
+        shutil.rmtree(temp_dir)
+
+    n_interactions = sum(len(values) for values in timings.values())
+    return {
+        'interactions': {
+            name: dict(
+                count=len(values),
+                sent_kb=float(np.mean(sent[name])) / 1024,
+                **{f'p{q}_ms': float(np.percentile(values, q)) * 1000 for q in PERCENTILES}
+            )
+            for name, values in sorted(timings.items())
+        },
+        'throughput': n_interactions / elapsed,
+        'peak_rss_mb': peak_rss_mb(),
+        'calibration_ms': calibration_ms,
+        'errors': [error for session in sessions for error in session.errors],
+    }
+
+
+def report(results):
+    
+    print(f"{'interaction':<12}{'count':>7}" + ''.join(f"{f'p{q} ms':>11}" for q in PERCENTILES) + f"{'sent KB':>11}")
+    for name, stats in results['interactions'].items():
+        print(f"{name:<12}{stats['count']:>7}" + ''.join(f"{stats[f'p{q}_ms']:>11.1f}" for q in PERCENTILES)
+              + f"{stats['sent_kb']:>11.1f}")
+    print(f"throughput {results['throughput']:.2f} interactions/s")
+    print(f"calibration {results['calibration_ms']:.1f} ms")
+    if results['peak_rss_mb'] is not None:
+        print(f"peak RSS {results['peak_rss_mb']:.0f} MB")
+    for error in results['errors']:
+        print(f"error: {error}")
+
+
+def find_over_budget(results, budget_kb=PAYLOAD_BUDGET_KB):
+    
+    return {
+        name: stats['sent_kb'] for name, stats in results['interactions'].items()
+        if stats['sent_kb'] > budget_kb
+    }
+
+
+def find_regressions(results, baseline, tolerance=TOLERANCE, latency_tolerance=LATENCY_TOLERANCE,
+                     budget_kb=PAYLOAD_BUDGET_KB):
+    
+    regressions = [
+        f"{name} sent_kb: {sent_kb:.1f} over the {budget_kb:.0f} KB budget"
+        for name, sent_kb in find_over_budget(results, budget_kb).items()
+    ]
+    # How much slower this machine is than the one the baseline comes from
+    scale = 1.0
+    if results.get('calibration_ms') and baseline.get('calibration_ms'):
+        scale = results['calibration_ms'] / baseline['calibration_ms']
+    for name, stats in baseline['interactions'].items():
+        current = results['interactions'].get(name)
+        if current is None:
+            regressions.append(f"{name}: interaction is gone")
+            continue
+        for q in COMPARED_PERCENTILES:
+            field = f'p{q}_ms'
+            expected = stats[field] * scale
+            if current[field] > expected * (1 + latency_tolerance):
+                regressions.append(f"{name} {field}: {current[field]:.1f} > {expected:.1f}")
+        if current['sent_kb'] > stats['sent_kb'] * (1 + tolerance):
+            regressions.append(f"{name} sent_kb: {current['sent_kb']:.1f} > {stats['sent_kb']:.1f}")
+    expected = baseline['throughput'] / scale
+    if results['throughput'] < expected * (1 - tolerance):
+        regressions.append(f"throughput: {results['throughput']:.2f} < {expected:.2f}")
+    if results['peak_rss_mb'] and baseline.get('peak_rss_mb') and \
+            results['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + tolerance):
+        regressions.append(f"peak RSS: {results['peak_rss_mb']:.0f} > {baseline['peak_rss_mb']:.0f} MB")
+    return regressions
+
+
+def main():
+    
+    parser = argparse.ArgumentParser(description='Headless load test of the display layer.')
+    parser.add_argument('--sessions', type=int, default=8, help='concurrent sessions')
+    parser.add_argument('--rows', type=int, default=50_000, help='rows of each generated file')
+    parser.add_argument('--files', type=int, default=4, help='distinct files shared by the sessions')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='allowed throughput, memory and payload regression')
+    parser.add_argument('--latency-tolerance', type=float, default=LATENCY_TOLERANCE,
+                        help='allowed p50 and p95 latency regression')
+    parser.add_argument('--budget-kb', type=float, default=PAYLOAD_BUDGET_KB,
+                        help='largest payload of one interaction')
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the baseline')
+    args = parser.parse_args()
+
+    results = run(args.sessions, args.rows, args.files)
+    report(results)
+    if results['errors']:
+        sys.exit(1)
+    over_budget = find_over_budget(results, args.budget_kb)
+    for name, sent_kb in over_budget.items():
+        print(f"over budget: {name} sends {sent_kb:.1f} KB, more than {args.budget_kb:.0f} KB")
+
+    scenario = f"{args.sessions}x{args.rows}x{args.files}"
+    baselines = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baselines = json.load(f)
+
+    if args.save_baseline:
+        # A payload over budget is a failure, not a normal to compare with
+        if over_budget:
+            sys.exit(1)
+        baselines[scenario] = {key: value for key, value in results.items() if key != 'errors'}
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Saved baseline for {scenario}")
+    elif scenario in baselines:
+        baseline = baselines[scenario]
+        regressions = find_regressions(results, baseline, args.tolerance, args.latency_tolerance, args.budget_kb)
+        for regression in regressions:
+            print(f"regression: {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regression against the {scenario} baseline")
+    else:
+        print(f"No baseline for {scenario}, run with --save-baseline to keep one")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# Time the time serie view and measure the chart payload as the number of
+# rows grows, the payload should stay flat.
+#
+#   python bench/timeseries_bench.py [max_rows]
+import sys
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(os.path.dirname(__file__)).resolve().parents[0]))
+
+from tab_ts.logics import TimeSerie
+
+
+def make_df(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 10 * 365 * 86400, n_rows), unit='s'),
+        'value': rng.normal(size=n_rows).cumsum(),
+    })
+
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    n_rows = 10_000
+    while n_rows <= max_rows:
+        df = make_df(n_rows)
+        for method in ('lttb', 'minmax'):
+            time_serie = TimeSerie(df=df)
+            time_serie.find_cols()
+            start = time.perf_counter()
+            time_serie.set_data('date', 'value', method=method)
+            elapsed = time.perf_counter() - start
+            payload = len(time_serie.chart.to_json())
+            print(f"{n_rows:>11} rows  {method:<6}  interval {time_serie.interval:<5}  "
+                  f"{len(time_serie.points):>4} points  {payload / 1024:8.1f} KB  {elapsed:7.3f}s")
+        n_rows *= 10
+
+
+if __name__ == '__main__':
+    main()
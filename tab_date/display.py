@@ -1,10 +1,25 @@
+import copy
+
 import streamlit as st
 
 from tab_date.logics import DateColumn
+from utils.executor import file_key, submit_profile, wait_profile
+from utils.sampling import STATUS_ESTIMATED
+
+def display_date_summary(date_column_instance):
+    
+    with st.expander("Date Column Summary"):
+        if date_column_instance.status == STATUS_ESTIMATED:
+            st.caption(f"Estimated from a random sample of {len(date_column_instance.serie)} rows, exact values are on the way.")
+        st.table(date_column_instance.get_summary())
+        if date_column_instance.status != STATUS_ESTIMATED:
+            st.altair_chart(date_column_instance.barchart, use_container_width=True)
+        st.write("Most frequent values:")
+        st.write(date_column_instance.frequent)
 
-def display_tab_date_content(file_path=None, df=None):
+def display_tab_date_content(file_path=None, df=None, sheet_name=None):
     
-    date_column_instance = DateColumn(file_path=file_path, df=df)
+    date_column_instance = DateColumn(file_path=file_path, df=df, sheet_name=sheet_name)
     st.session_state.date_column_instance = date_column_instance
 
     try:    
@@ -17,12 +32,25 @@ def display_tab_date_content(file_path=None, df=None):
 
     if selected_column:
         
-        date_column_instance.set_data(selected_column)
-        
+        status = st.empty()
+        results = st.empty()
+        estimate = copy.copy(date_column_instance)
+        future = submit_profile(
+            slot=(st.session_state.get("session_id"), "date"),
+            job_key=(file_key(file_path, df, sheet_name), "date", selected_column),
+            profiler=date_column_instance,
+            col_name=selected_column,
+        )
+
+        # Show sample estimates while the exact pass runs, then replace them.
+        # Columns already in the store load quickly enough without them
+        ready = future.done() or estimate.has_stored_results(selected_column)
+        if not ready and estimate.set_estimates(selected_column):
+            with results.container():
+                display_date_summary(estimate)
         
-        with st.expander("Date Column Summary"):
-            st.table(date_column_instance.get_summary())
-            st.altair_chart(date_column_instance.barchart, use_container_width=True)
-            st.write("Most frequent values:")
-            st.write(date_column_instance.frequent)
+        profiled = wait_profile(future, selected_column, placeholder=status)
+        if profiled is not None:
+            with results.container():
+                display_date_summary(profiled)
 
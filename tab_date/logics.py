@@ -1,12 +1,30 @@
 import pandas as pd
 import altair as alt
 import datetime
+
+from utils.charts import categorical_barchart
+from utils.executor import check_cancelled
+from utils.loader import load_dataframe
+from utils.results import DateProfile
+from utils.sampling import (ESTIMATE_SAMPLE_SIZE, STATUS_ESTIMATED, STATUS_EXACT, estimate_unique, sample_serie,
+                            scale_counts)
+from utils.store import has_results, load_results, save_results
+
 class DateColumn:
-    def __init__(self, file_path=None, df=None):
+    RESULT_VERSION = 4
+    RESULT_FIELDS = ['result', 'barchart']
+    ESTIMATE_COUNT_FIELDS = ['n_missing', 'n_weekend', 'n_weekday', 'n_future', 'n_empty_1900', 'n_empty_1970']
+
+    def __init__(self, file_path=None, df=None, sheet_name=None):
         self.file_path = file_path
+        self.sheet_name = sheet_name
         self.df = df
         self.cols_list = []
         self.serie = None
+        self.cancel_token = None
+        self.status = None
+        self.result = None
+        self.n_rows = None
         self.n_unique = None
         self.n_missing = None
         self.col_min = None
@@ -23,10 +41,7 @@ class DateColumn:
         
         if self.df is None and self.file_path:
             
-            try:
-                self.df = pd.read_csv(self.file_path)
-            except UnicodeDecodeError:
-                self.df = pd.read_csv(self.file_path,encoding = "ISO-8859-1")
+            self.df = load_dataframe(self.file_path, sheet_name=self.sheet_name)
 
         if self.df is not None:
             
@@ -58,27 +73,64 @@ class DateColumn:
                 
                 self.serie = self.df[col_name]
                 
+                params = self.get_store_params()
+                if load_results(self, col_name, params):
+                    self.result.apply_to(self)
+                    return
                 
                 if self.serie.dtype != 'datetime64':
                     self.convert_serie_to_date()
 
                 
-                self.set_unique()
-                self.set_missing()
-                self.set_min()
-                self.set_max()
-                self.set_weekend()
-                self.set_weekday()
-                self.set_future()
-                self.set_empty_1900()
-                self.set_empty_1970()
-                self.set_barchart()
-                self.set_frequent()
+                # A cancelled job stops at the next step
+                for step in (self.set_unique, self.set_missing, self.set_min, self.set_max, self.set_weekend,
+                             self.set_weekday, self.set_future, self.set_empty_1900, self.set_empty_1970,
+                             self.set_frequent, self.set_barchart):
+                    check_cancelled(self.cancel_token)
+                    step()
+                self.n_rows = len(self.serie)
+                self.status = STATUS_EXACT
+                self.set_result()
+                save_results(self, col_name, params)
             else:
                 print(f"Column '{col_name}' does not exist in the DataFrame.")
         else:
             print("DataFrame is not loaded. Use 'find_date_cols' to load the DataFrame.")
 
+    def get_store_params(self):
+        
+        # Future dates depend on the current day
+        return {'today': datetime.date.today().isoformat()}
+
+    def has_stored_results(self, col_name):
+        
+        return has_results(self, col_name, self.get_store_params())
+
+    def set_estimates(self, col_name, sample_size=ESTIMATE_SAMPLE_SIZE, seed=0):
+        
+        if self.df is None or col_name not in self.df.columns:
+            return False
+        serie = self.df[col_name]
+        if len(serie) <= sample_size:
+            return False
+
+        self.serie = sample_serie(serie, sample_size, seed)
+        if self.serie.dtype != 'datetime64':
+            self.convert_serie_to_date()
+        for step in (self.set_missing, self.set_min, self.set_max, self.set_weekend, self.set_weekday,
+                     self.set_future, self.set_empty_1900, self.set_empty_1970, self.set_frequent):
+            step()
+        scale_counts(self, self.ESTIMATE_COUNT_FIELDS, len(serie))
+        self.n_unique = estimate_unique(self.serie, len(serie))
+        self.n_rows = len(serie)
+        self.status = STATUS_ESTIMATED
+        self.set_result()
+        return True
+
+    def set_result(self):
+        
+        self.result = DateProfile.from_profiler(self)
+
 
 
 
@@ -204,20 +256,11 @@ class DateColumn:
         
         if self.serie is not None:
             
-            value_counts_df = self.serie.value_counts().reset_index()
-            value_counts_df.columns = ['value', 'count']
-
-            
-            chart = alt.Chart(value_counts_df).mark_bar().encode(
-                x='value',
-                y='count',
-                tooltip=['value', 'count']
-            ).properties(
-                title='Bar Chart: Count of Unique Values'
-            )
-
-            
-            self.barchart = chart
+            # Built from the frequent values, the other values share one bar
+            if self.frequent.empty:
+                self.set_frequent()
+            self.barchart = categorical_barchart(self.frequent, self.serie.count(),
+                                                 title='Bar Chart: Count of Unique Values')
         else:
             
             print("Series is empty or None. Use 'set_data' to specify the column for analysis.")
@@ -245,29 +288,13 @@ class DateColumn:
 
     def get_summary(self):
         
-        if self.serie is not None:
+        if self.serie is not None and self.result is not None:
             
-            summary_df = pd.DataFrame({
-                'Description': ['Number of Unique Values', 'Number of Missing Values', 'Minimum Value', 'Maximum Value',
-                                'Number of Weekend Dates', 'Number of Weekday Dates', 'Number of Future Dates',
-                                'Number of Dates equal to 1900-01-01', 'Number of Dates equal to 1970-01-01'],
-                'Value': [self.n_unique, self.n_missing, self.col_min, self.col_max,
-                        self.n_weekend, self.n_weekday, self.n_future, self.n_empty_1900, self.n_empty_1970]
-            })
-
-            
-            
-            
-            
-            
-            
-
-            summary_df = summary_df.astype(str)
-            return summary_df
+            return self.result.to_frame()
         else:
             
             print("Series is empty or None. Use 'set_data' to specify the column for analysis.")
-            return pd.DataFrame(columns=['Description', 'Value'])
+            return pd.DataFrame(columns=['Description', 'Value', 'Status'])
 
 
 
@@ -2,13 +2,13 @@ import streamlit as st
 
 from tab_df.logics import Dataset
 
-def display_tab_df_content(file_path):
+def display_tab_df_content(file_path, sheet_name=None):
     
-    dataset = Dataset(file_path)
+    dataset = Dataset(file_path, sheet_name=sheet_name)
     try:
         dataset.set_df()
     except Exception as e:
-        st.error("Unable to parse dataframe are you sure you are using CSV format")
+        st.error("Unable to parse dataframe are you sure you are using CSV or Excel format")
         return
     
     dataset.set_data()
@@ -17,9 +17,16 @@ def display_tab_df_content(file_path):
 
         
         st.table(summary_df)
-        dataset.table = dataset.table.astype(str)
         st.write("Columns")
-        st.table(dataset.table)
+        st.table(dataset.result.get_frame('columns'))
+
+    with st.expander("Missing Values"):
+        st.write("Missing values per column")
+        st.table(dataset.null_counts)
+        st.write("Rows missing in both columns")
+        st.dataframe(dataset.co_missing)
+        st.write("Nullity along the rows")
+        st.altair_chart(dataset.nullity_heatmap, use_container_width=True)
     
     
     with st.expander("Display Subset of Data"):
@@ -1,9 +1,72 @@
+import numpy as np
 import pandas as pd
+import altair as alt
+
+from utils.loader import load_dataframe
+from utils.results import DatasetProfile
+from utils.store import load_results, save_results
+
+
+NULLITY_CHUNK_ROWS = 1 << 20
+NULLITY_BINS = 100
+POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount(packed, out=None):
+    
+    # numpy >= 2.0 has a native popcount, older versions use a lookup table
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(packed, out=out)
+    return np.take(POPCOUNT_TABLE, packed, out=out)
+
+
+def pack_null_masks(df, chunk_rows=NULLITY_CHUNK_ROWS):
+    
+    # One bit per cell, rows are packed chunk by chunk so the boolean mask
+    # never exists for more than chunk_rows rows of one column
+    chunk_rows -= chunk_rows % 8
+    n_rows = len(df)
+    masks = np.zeros((df.shape[1], (n_rows + 7) // 8), dtype=np.uint8)
+    for i in range(df.shape[1]):
+        serie = df.iloc[:, i]
+        for start in range(0, n_rows, chunk_rows):
+            chunk = serie.iloc[start:start + chunk_rows].isna().to_numpy()
+            masks[i, start // 8:(start + len(chunk) + 7) // 8] = np.packbits(chunk)
+    return masks
+
+
+def co_missing_counts(masks, block_cols=64, chunk_bytes=1 << 16):
+    
+    # Rows missing in both columns of every pair, counted on the packed bits.
+    # Pairs go by block of columns and chunk of bytes, so the temporaries
+    # never hold more than block_cols x chunk_bytes bytes
+    n_cols, n_bytes = masks.shape
+    counts = np.zeros((n_cols, n_cols), dtype=np.int64)
+    # Columns without missing values only add zeros
+    with_missing = np.flatnonzero(masks.any(axis=1))
+    both = np.empty((block_cols, chunk_bytes), dtype=np.uint8)
+    bits = np.empty((block_cols, chunk_bytes), dtype=np.uint8)
+    for k, i in enumerate(with_missing):
+        for block in range(k, len(with_missing), block_cols):
+            others = with_missing[block:block + block_cols]
+            total = np.zeros(len(others), dtype=np.int64)
+            for start in range(0, n_bytes, chunk_bytes):
+                stop = min(start + chunk_bytes, n_bytes)
+                out = both[:len(others), :stop - start]
+                np.bitwise_and(masks[i, start:stop], masks[others, start:stop], out=out)
+                total += popcount(out, out=bits[:len(others), :stop - start]).sum(axis=1, dtype=np.int64)
+            counts[i, others] = total
+            counts[others, i] = total
+    return counts
 
 
 class Dataset:
-    def __init__(self, file_path):
+    RESULT_VERSION = 4
+    RESULT_FIELDS = ['result', 'null_counts', 'co_missing', 'nullity_heatmap']
+
+    def __init__(self, file_path, sheet_name=None):
         self.file_path = file_path
+        self.sheet_name = sheet_name
         self.df = None
         self.cols_list = []
         self.n_rows = 0
@@ -13,28 +76,39 @@ class Dataset:
         self.n_num_cols = 0
         self.n_text_cols = 0
         self.table = None
+        self.null_masks = None
+        self.null_counts = pd.DataFrame(columns=['Column Name', 'Missing Values', 'Missing Rate'])
+        self.co_missing = pd.DataFrame()
+        self.nullity_heatmap = alt.Chart()
+        self.result = None
 
     def set_data(self):
         
         if not self.is_df_none():
             
+            params = {'sheet_name': self.sheet_name}
+            if load_results(self, None, params):
+                self.result.apply_to(self)
+                return
+
             self.set_columns()
             self.set_dimensions()
             self.set_duplicates()
             self.set_missing()
+            self.set_co_missing()
+            self.set_nullity_heatmap()
             self.set_numeric()
             self.set_text()
             self.set_table()
+            self.result = DatasetProfile.from_profiler(self)
+            save_results(self, None, params)
 
     
     def set_df(self):
         
         if self.df is None:
             
-            try:
-                self.df = pd.read_csv(self.file_path)
-            except UnicodeDecodeError:
-                self.df = pd.read_csv(self.file_path,encoding = "ISO-8859-1")
+            self.df = load_dataframe(self.file_path, sheet_name=self.sheet_name)
 
 
     def is_df_none(self):
@@ -66,7 +140,53 @@ class Dataset:
     def set_missing(self):
         
         if not self.is_df_none():
-            self.n_missing = self.df.isnull().sum().sum() 
+            self.set_null_masks()
+            counts = popcount(self.null_masks).sum(axis=1, dtype=np.int64)
+            self.n_missing = int(counts.sum())
+            self.null_counts = pd.DataFrame({
+                'Column Name': self.df.columns,
+                'Missing Values': counts,
+                'Missing Rate': counts / max(len(self.df), 1),
+            })
+
+
+    def set_null_masks(self):
+        
+        if self.null_masks is None and not self.is_df_none():
+            self.null_masks = pack_null_masks(self.df)
+
+
+    def set_co_missing(self):
+        
+        if not self.is_df_none():
+            self.set_null_masks()
+            co_missing = co_missing_counts(self.null_masks)
+            self.co_missing = pd.DataFrame(co_missing, index=self.df.columns, columns=self.df.columns)
+
+
+    def set_nullity_heatmap(self, n_bins=NULLITY_BINS):
+        
+        if not self.is_df_none():
+            self.set_null_masks()
+            n_rows = len(self.df)
+            n_bytes = self.null_masks.shape[1]
+            # Bins are whole bytes of the packed masks
+            starts = np.arange(0, n_bytes, -(-n_bytes // n_bins))
+            missing = np.add.reduceat(popcount(self.null_masks), starts, axis=1, dtype=np.int64)
+            first_rows = starts * 8
+            bin_rows = np.minimum(np.append(first_rows[1:], n_rows), n_rows) - first_rows
+
+            nullity = pd.DataFrame({
+                'Column Name': np.repeat(self.df.columns.to_numpy(), len(starts)),
+                'First Row': np.tile(first_rows, len(self.df.columns)),
+                'Missing Rate': (missing / bin_rows).ravel(),
+            })
+            self.nullity_heatmap = alt.Chart(nullity).mark_rect().encode(
+                alt.X('Column Name:N', sort=None),
+                alt.Y('First Row:O', title='Rows', axis=alt.Axis(labelOverlap=True)),
+                alt.Color('Missing Rate:Q', scale=alt.Scale(domain=[0, 1], scheme='greys')),
+                tooltip=['Column Name', 'First Row', 'Missing Rate']
+            )
 
 
     def set_numeric(self):
@@ -124,24 +244,5 @@ class Dataset:
 
     def get_summary(self):
         
-        summary_data = {
-            'Description': [
-                'Number of Rows',
-                'Number of Columns',
-                'Number of Duplicates',
-                'Number of Missing Values',
-                'Number of Numeric Columns',
-                'Number of Text Columns',
-            ],
-            'Value': [
-                self.n_rows,
-                self.n_cols,
-                self.n_duplicates,
-                self.n_missing,
-                self.n_num_cols,
-                self.n_text_cols,
-            ]
-        }
-        summary_df = pd.DataFrame(summary_data)
-        
-        return summary_df
\ No newline at end of file
+        result = self.result if self.result is not None else DatasetProfile.from_profiler(self)
+        return result.to_frame()
@@ -1,11 +1,30 @@
+import copy
+
 import streamlit as st
-from tab_num.logics import NumericColumn
+from tab_num.logics import CORRELATION_DECIMALS, NumericColumn
+from utils.executor import file_key, submit_profile, wait_profile
+from utils.sampling import STATUS_ESTIMATED
+
+
+def display_numeric_summary(numeric_col):
+    
+    with st.expander("Numeric Column Information"):
+        
+        if numeric_col.status == STATUS_ESTIMATED:
+            st.caption(f"Estimated from a random sample of {len(numeric_col.serie)} rows, exact values are on the way.")
+        st.table(numeric_col.get_summary())
+        
+        if numeric_col.status != STATUS_ESTIMATED:
+            st.altair_chart(numeric_col.histogram, use_container_width=True)
+
+        st.write("Frequent Values:")
+        st.write(numeric_col.frequent)
 
 
 #display logic for tab_num
-def display_tab_num_content(file_path=None, df=None):
+def display_tab_num_content(file_path=None, df=None, sheet_name=None):
     
-    numeric_col = NumericColumn(file_path=file_path, df=df)
+    numeric_col = NumericColumn(file_path=file_path, df=df, sheet_name=sheet_name)
     try:
         numeric_col.find_num_cols()
     except Exception as e:
@@ -18,14 +37,53 @@ def display_tab_num_content(file_path=None, df=None):
 
     if selected_col:
         
-        numeric_col.set_data(selected_col)
+        status = st.empty()
+        results = st.empty()
+        estimate = copy.copy(numeric_col)
+        future = submit_profile(
+            slot=(st.session_state.get("session_id"), "num"),
+            job_key=(file_key(file_path, df, sheet_name), "num", selected_col),
+            profiler=numeric_col,
+            col_name=selected_col,
+        )
         
+        # Show sample estimates while the exact pass runs, then replace them.
+        # Columns already in the store load quickly enough without them
+        ready = future.done() or estimate.has_stored_results(selected_col)
+        if not ready and estimate.set_estimates(selected_col):
+            with results.container():
+                display_numeric_summary(estimate)
+        
+        profiled = wait_profile(future, selected_col, placeholder=status)
+        if profiled is not None:
+            numeric_col = profiled
+            with results.container():
+                display_numeric_summary(numeric_col)
 
-        with st.expander("Numeric Column Information"):
-            
-            st.table(numeric_col.get_summary())
-            
-            st.altair_chart(numeric_col.histogram, use_container_width=True)
+    if selected_col and numeric_col.group_cols_list:
+
+        with st.expander("Grouped Numeric Profile"):
+
+            group_col = st.selectbox("Group by text column", numeric_col.group_cols_list)
+            top_k = st.slider("Number of largest groups to show", 1, 100, 20)
+
+            numeric_col.set_grouped(selected_col, group_col, top_k=top_k)
+            st.dataframe(numeric_col.grouped)
+
+    if len(numeric_col.cols_list) > 1:
+
+        with st.expander("Correlation Matrix"):
+
+            method = st.radio("Select the correlation method", ("Pearson", "Spearman"))
+            sample_size = None
+            if st.checkbox("Estimate on a random sample of rows"):
+                sample_size = st.slider("Number of sampled rows", 100, 100_000, 10_000, step=100)
 
-            st.write("Frequent Values:")
-            st.write(numeric_col.frequent)
\ No newline at end of file
+            numeric_col.set_correlation(method=method.lower(), sample_size=sample_size)
+            if len(numeric_col.heatmap_cols) < len(numeric_col.cols_list):
+                st.caption(f"Showing the {len(numeric_col.heatmap_cols)} most correlated of "
+                           f"{len(numeric_col.cols_list)} numeric columns.")
+            st.altair_chart(numeric_col.heatmap, use_container_width=True)
+            st.dataframe(numeric_col.get_correlation_matrix(numeric_col.heatmap_cols).round(CORRELATION_DECIMALS))
+            st.write("Most correlated pairs:")
+            st.dataframe(numeric_col.get_top_pairs())
@@ -1,14 +1,109 @@
+import os
+
+import numpy as np
 import pandas as pd
 import altair as alt
 
+from utils.cache import file_hash, get_cached, set_cached
+from utils.charts import CHART_SPEC_BYTES, spec_size
+from utils.coerce import clean_numeric_text
+from utils.executor import check_cancelled
+from utils.loader import load_dataframe
+from utils.results import NumericProfile
+from utils.sampling import (ESTIMATE_SAMPLE_SIZE, STATUS_ESTIMATED, STATUS_EXACT, estimate_unique, mean_interval,
+                            median_interval, sample_serie, scale_counts, std_interval)
+from utils.store import has_results, load_results, save_results
+
+
+GROUPED_STATS = ['count', 'missing', 'mean', 'std', 'min', 'max', 'median', 'zeros', 'negatives']
+OTHER_GROUP = 'other'
+CORRELATION_METHODS = ['pearson', 'spearman']
+CORRELATION_DECIMALS = 3
+HISTOGRAM_BINS = 20
+
+
+def prepare_block(values, means):
+    
+    # NaN cells are zeroed and excluded through the validity mask
+    mask = ~np.isnan(values)
+    centered = np.where(mask, values - means, 0.0)
+    return mask.astype(np.float64), centered, centered ** 2
+
+
+def pairwise_correlation(values, block_size=64):
+    
+    # Pearson correlation over pairwise-complete rows, built from matrix
+    # products of column blocks. The masks and centered values are only
+    # made for the two blocks in flight, never for the whole matrix.
+    values = np.asarray(values, dtype=np.float64)
+    means = np.nanmean(values, axis=0)
+
+    n_cols = values.shape[1]
+    corr = np.full((n_cols, n_cols), np.nan)
+    counts = np.zeros((n_cols, n_cols), dtype=np.int64)
+
+    for i in range(0, n_cols, block_size):
+        block_i = slice(i, i + block_size)
+        valid_i, centered_i, squared_i = prepare_block(values[:, block_i], means[block_i])
+        for j in range(i, n_cols, block_size):
+            block_j = slice(j, j + block_size)
+            if j == i:
+                valid_j, centered_j, squared_j = valid_i, centered_i, squared_i
+            else:
+                valid_j, centered_j, squared_j = prepare_block(values[:, block_j], means[block_j])
+
+            n = valid_i.T @ valid_j
+            sum_x = centered_i.T @ valid_j
+            sum_y = valid_i.T @ centered_j
+            sum_xx = squared_i.T @ valid_j
+            sum_yy = valid_i.T @ squared_j
+            sum_xy = centered_i.T @ centered_j
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cov = sum_xy - sum_x * sum_y / n
+                var_x = sum_xx - sum_x ** 2 / n
+                var_y = sum_yy - sum_y ** 2 / n
+                block = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+            block[n < 2] = np.nan
+
+            corr[block_i, block_j] = block
+            corr[block_j, block_i] = block.T
+            counts[block_i, block_j] = n
+            counts[block_j, block_i] = n.T
+
+    return corr, counts
+
+
+def correlation_interval(corr, counts, z_score=1.96):
+    
+    # Fisher z-transform confidence interval for each coefficient
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.arctanh(np.clip(corr, -0.999999, 0.999999))
+        se = 1 / np.sqrt(counts - 3)
+        low = np.tanh(z - z_score * se)
+        high = np.tanh(z + z_score * se)
+    low[counts <= 3] = np.nan
+    high[counts <= 3] = np.nan
+    return low, high
+
 
 class NumericColumn:
+    RESULT_VERSION = 3
+    RESULT_FIELDS = ['result']
+    ESTIMATE_COUNT_FIELDS = ['n_missing', 'n_zeros', 'n_negatives']
    
-    def __init__(self, file_path=None, df=None):
+    def __init__(self, file_path=None, df=None, sheet_name=None):
         self.file_path = file_path
+        self.sheet_name = sheet_name
         self.df = df
         self.cols_list = []
+        self.group_cols_list = []
         self.serie = None
+        self.cancel_token = None
+        self.status = None
+        self.intervals = {}
+        self.result = None
+        self.n_rows = None
         self.n_unique = None
         self.n_missing = None
         self.col_mean = None
@@ -19,20 +114,23 @@ class NumericColumn:
         self.n_zeros = None
         self.n_negatives = None
         self.histogram = alt.Chart()
+        self.histogram_counts = pd.DataFrame(columns=['start', 'end', 'count'])
         self.frequent = pd.DataFrame(columns=['value', 'occurrence', 'percentage'])
+        self.grouped = pd.DataFrame(columns=GROUPED_STATS)
+        self.correlation = pd.DataFrame(columns=['column_x', 'column_y', 'correlation', 'n', 'ci_low', 'ci_high'])
+        self.heatmap = alt.Chart()
+        self.heatmap_cols = []
 
     def find_num_cols(self):
         
         if self.df is None and self.file_path is not None:
             
-            try:
-                self.df = pd.read_csv(self.file_path)
-            except UnicodeDecodeError:
-                self.df = pd.read_csv(self.file_path,encoding = "ISO-8859-1")
+            self.df = load_dataframe(self.file_path, sheet_name=self.sheet_name)
 
         if self.df is not None:
             
             self.cols_list = self.df.select_dtypes(include=['number']).columns.tolist()
+            self.group_cols_list = self.df.select_dtypes(include=['object']).columns.tolist()
         
 
     def set_data(self, col_name):
@@ -45,17 +143,24 @@ class NumericColumn:
             
             if not self.is_serie_none():
                 
-                self.set_unique()
-                self.set_missing()
-                self.set_mean()
-                self.set_std()
-                self.set_min()
-                self.set_max()
-                self.set_median()
-                self.set_zeros()
-                self.set_negatives()
+                if load_results(self, col_name):
+                    self.result.apply_to(self)
+                else:
+                    # A cancelled job stops at the next step
+                    for step in (self.set_unique, self.set_missing, self.set_mean, self.set_std, self.set_min,
+                                 self.set_max, self.set_median, self.set_zeros, self.set_negatives,
+                                 self.set_frequent):
+                        check_cancelled(self.cancel_token)
+                        step()
+                    self.n_rows = len(self.serie)
+                    self.status = STATUS_EXACT
+                    self.intervals = {}
+                    self.set_result()
+                    save_results(self, col_name)
+                
+                # The histogram is a single pass over the column, it is
+                # rebuilt rather than stored
                 self.set_histogram()
-                self.set_frequent()
         else:
             raise ValueError(f"Column '{col_name}' is not numeric or doesn't exist in the DataFrame.")
 
@@ -65,12 +170,48 @@ class NumericColumn:
 
 
 
+    def has_stored_results(self, col_name):
+        
+        return has_results(self, col_name)
+
+    def set_estimates(self, col_name, sample_size=ESTIMATE_SAMPLE_SIZE, seed=0):
+        
+        if col_name not in self.cols_list:
+            raise ValueError(f"Column '{col_name}' is not numeric or doesn't exist in the DataFrame.")
+
+        serie = self.df[col_name]
+        if len(serie) <= sample_size:
+            return False
+
+        self.serie = sample_serie(serie, sample_size, seed)
+        for step in (self.set_missing, self.set_mean, self.set_std, self.set_min, self.set_max, self.set_median,
+                     self.set_zeros, self.set_negatives, self.set_frequent):
+            step()
+        scale_counts(self, self.ESTIMATE_COUNT_FIELDS, len(serie))
+        self.n_unique = estimate_unique(self.serie, len(serie))
+        self.intervals = {
+            'col_mean': mean_interval(self.serie),
+            'col_std': std_interval(self.serie),
+            'col_median': median_interval(self.serie),
+        }
+        self.n_rows = len(serie)
+        self.status = STATUS_ESTIMATED
+        self.set_result()
+        return True
+
+    def set_result(self):
+        
+        self.result = NumericProfile.from_profiler(self)
+
     def convert_serie_to_num(self):
         
         if not self.is_serie_none():
             try:
                 # Convert the Pandas Series to a numeric data type
-                self.serie = pd.to_numeric(self.serie, errors='coerce')
+                if self.serie.dtype == 'object':
+                    self.serie = clean_numeric_text(self.serie)
+                else:
+                    self.serie = pd.to_numeric(self.serie, errors='coerce')
             except ValueError:
                 # Handle any conversion errors
                 # You can add error handling logic here, e.g., logging
@@ -137,13 +278,25 @@ class NumericColumn:
         if not self.is_serie_none():
             self.col_median = self.serie.median()
 
-    def set_histogram(self):
+    def set_histogram(self, bins=HISTOGRAM_BINS):
         if not self.is_serie_none():
             
-            chart = alt.Chart(self.df)
+            # The bins are counted here, the chart only carries one row per
+            # bin instead of the whole DataFrame
+            values = self.serie.to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[np.isfinite(values)]
+            if len(values):
+                counts, edges = np.histogram(values, bins=bins)
+            else:
+                counts, edges = np.zeros(0, dtype=np.int64), np.zeros(1)
+            self.histogram_counts = pd.DataFrame({'start': edges[:-1], 'end': edges[1:], 'count': counts})
+            
+            chart = alt.Chart(self.histogram_counts)
             chart = chart.mark_bar().encode(
-                alt.X(f'{self.serie.name}:O', bin=alt.Bin(maxbins=20), title=self.serie.name),
-                alt.Y('count()', title='Count')
+                alt.X('start:Q', bin='binned', title=self.serie.name),
+                alt.X2('end:Q'),
+                alt.Y('count:Q', title='Count'),
+                tooltip=['start', 'end', 'count']
             )
             
             self.histogram = chart
@@ -163,31 +316,166 @@ class NumericColumn:
         
     def get_summary(self,):
         
-        summary_data = {
-            "Description": [
-                "Number of Unique Values",
-                "Number of Missing Values",
-                "Average (Mean)",
-                "Standard Deviation",
-                "Minimum Value",
-                "Maximum Value",
-                "Median Value",
-                "Number of Zeros",
-                "Number of Negatives",
-            ],
-            "Value": [
-                self.n_unique if not self.is_serie_none() else "N/A",
-                self.n_missing if not self.is_serie_none() else "N/A",
-                self.col_mean if not self.is_serie_none() else "N/A",
-                self.col_std if not self.is_serie_none() else "N/A",
-                self.col_min if not self.is_serie_none() else "N/A",
-                self.col_max if not self.is_serie_none() else "N/A",
-                self.col_median if not self.is_serie_none() else "N/A",
-                self.n_zeros if not self.is_serie_none() else "N/A",
-                self.n_negatives if not self.is_serie_none() else "N/A",
-            ],
-        }
+        if self.result is None or self.is_serie_none():
+            return NumericProfile().to_frame()
+        return self.result.to_frame()
+
+    def set_grouped(self, col_name, group_col, top_k=20):
+        
+        if col_name not in self.cols_list:
+            raise ValueError(f"Column '{col_name}' is not numeric or doesn't exist in the DataFrame.")
+        if group_col not in self.df.columns:
+            raise ValueError(f"Column '{group_col}' doesn't exist in the DataFrame.")
+
+        values = self.df[col_name]
+        
+        # Rank groups by size on integer codes so the big groups are kept and
+        # every remaining group shares a single "other" code
+        codes, uniques = pd.factorize(self.df[group_col], use_na_sentinel=False)
+        sizes = np.bincount(codes, minlength=len(uniques))
+        order = np.argsort(-sizes, kind='stable')
+        kept = order[:top_k]
+
+        remap = np.full(len(uniques), len(kept), dtype=np.int64)
+        remap[kept] = np.arange(len(kept))
+        # Distinct groups can print the same, 1 and '1' or NaN and 'nan', and
+        # a real group may already be called "other"
+        labels = []
+        for label in uniques[kept]:
+            label = str(label)
+            while label in labels:
+                label = f"({label})"
+            labels.append(label)
+        if len(uniques) > len(kept):
+            other = OTHER_GROUP
+            while other in labels:
+                other = f"({other})"
+            labels.append(other)
+
+        frame = pd.DataFrame({
+            'group': remap[codes],
+            'value': values,
+            'is_missing': values.isna(),
+            'is_zero': values == 0,
+            'is_negative': values < 0,
+        })
+        
+        # All statistics come out of a single groupby aggregation
+        grouped = frame.groupby('group', sort=True).agg(
+            count=('value', 'count'),
+            missing=('is_missing', 'sum'),
+            mean=('value', 'mean'),
+            std=('value', 'std'),
+            min=('value', 'min'),
+            max=('value', 'max'),
+            median=('value', 'median'),
+            zeros=('is_zero', 'sum'),
+            negatives=('is_negative', 'sum'),
+        )
+        grouped.index = [labels[code] for code in grouped.index]
+        grouped.index.name = group_col
+
+        self.grouped = grouped[GROUPED_STATS]
+
+
+    def set_correlation(self, method='pearson', sample_size=None, block_size=64, seed=0):
+        
+        if method not in CORRELATION_METHODS:
+            raise ValueError(f"Correlation method '{method}' is not one of {CORRELATION_METHODS}.")
+        if len(self.cols_list) < 2:
+            return
+
+        key = None
+        if self.file_path is not None and os.path.exists(self.file_path):
+            key = (file_hash(self.file_path), self.sheet_name, 'correlation', tuple(self.cols_list), method,
+                   sample_size, seed)
+            cached = get_cached(key)
+            if cached is not None:
+                # Every session gets its own copies of what is cached
+                correlation, heatmap, heatmap_cols = cached
+                self.correlation = correlation.copy()
+                self.heatmap = heatmap.copy()
+                self.heatmap.data = heatmap.data.copy()
+                self.heatmap_cols = list(heatmap_cols)
+                return
+
+        data = self.df[self.cols_list]
+        sampled = sample_size is not None and sample_size < len(data)
+        if sampled:
+            data = data.sample(n=sample_size, random_state=seed)
+        if method == 'spearman':
+            # Spearman is Pearson on the ranks, NaN stays NaN
+            data = data.rank()
+
+        corr, counts = pairwise_correlation(data.to_numpy(dtype=np.float64, na_value=np.nan), block_size)
+        if sampled:
+            low, high = correlation_interval(corr, counts)
+        else:
+            low = high = np.full(corr.shape, np.nan)
+
+        n_cols = len(self.cols_list)
+        # An object array keeps the names as they are, numbers included
+        names = np.array(self.cols_list, dtype=object)
+        self.correlation = pd.DataFrame({
+            'column_x': np.repeat(names, n_cols),
+            'column_y': np.tile(names, n_cols),
+            'correlation': corr.ravel(),
+            'n': counts.ravel(),
+            'ci_low': low.ravel(),
+            'ci_high': high.ravel(),
+        })
+        self.set_heatmap()
+
+        if key is not None:
+            heatmap = self.heatmap.copy()
+            heatmap.data = self.heatmap.data.copy()
+            set_cached(key, (self.correlation.copy(), heatmap, list(self.heatmap_cols)))
+
+    def set_heatmap(self, max_bytes=CHART_SPEC_BYTES):
+        
+        # The matrix has one cell per pair, so with many columns only the
+        # most correlated ones are drawn, as many as fit in the spec budget
+        matrix = self.get_correlation_matrix()
+        strength = matrix.abs().where(~np.eye(len(matrix), dtype=bool)).max().fillna(0)
+        cells = self.correlation.round(CORRELATION_DECIMALS)
+        sample_bytes = len(cells.head(100).to_json(orient='records')) / max(min(len(cells), 100), 1)
+        n_cols = min(len(self.cols_list), max(int(np.sqrt(max_bytes / sample_bytes)), 2))
+
+        while True:
+            kept = strength.nlargest(n_cols).index
+            self.heatmap_cols = [col for col in self.cols_list if col in kept]
+            shown = cells[cells['column_x'].isin(self.heatmap_cols) & cells['column_y'].isin(self.heatmap_cols)]
+            chart = alt.Chart(shown).mark_rect().encode(
+                alt.X('column_x:N', title=None, sort=self.heatmap_cols),
+                alt.Y('column_y:N', title=None, sort=self.heatmap_cols),
+                alt.Color('correlation:Q', scale=alt.Scale(scheme='redblue', domain=[-1, 1])),
+                tooltip=['column_x', 'column_y', 'correlation', 'n', 'ci_low', 'ci_high']
+            )
+            size = spec_size(chart)
+            if n_cols <= 2 or size <= max_bytes:
+                break
+            # Cells grow with the square of the columns
+            n_cols = max(min(int(n_cols * np.sqrt(max_bytes / size) * 0.95), n_cols - 1), 2)
+        
+        self.heatmap = chart
+
+    def get_correlation_matrix(self, cols=None):
+        
+        # Rows go column_x by column_x in the cols_list order, reshaping by
+        # position works whatever the types of the column names
+        n_cols = len(self.cols_list)
+        matrix = pd.DataFrame(self.correlation['correlation'].to_numpy().reshape(n_cols, n_cols),
+                              index=self.cols_list, columns=self.cols_list)
+        if cols is None:
+            return matrix
+        positions = [self.cols_list.index(col) for col in cols]
+        return matrix.iloc[positions, positions]
 
-        summary_df = pd.DataFrame(summary_data)
+    def get_top_pairs(self, n=20):
         
-        return summary_df
+        # Each pair once, strongest first. Pairs are picked by position since
+        # names mixing numbers and text can't be compared
+        x, y = np.divmod(np.arange(len(self.correlation)), len(self.cols_list))
+        pairs = self.correlation[x < y]
+        order = pairs['correlation'].abs().sort_values(ascending=False, na_position='last').index
+        return pairs.loc[order].head(n).reset_index(drop=True)
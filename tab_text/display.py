@@ -1,10 +1,31 @@
+import copy
+
 import streamlit as st
 
 from tab_text.logics import TextColumn
+from utils.executor import file_key, submit_profile, wait_profile
+from utils.sampling import STATUS_ESTIMATED
 
-def display_tab_text_content(file_path=None, df=None):
+def display_text_summary(text_column):
     
-    text_column = TextColumn(file_path=file_path, df=df)
+    with st.expander('Text Column Summary'):
+        
+        if text_column.status == STATUS_ESTIMATED:
+            st.caption(f'Estimated from a random sample of {len(text_column.serie)} rows, exact values are on the way.')
+        st.table(text_column.get_summary())
+
+        if text_column.status != STATUS_ESTIMATED:
+            st.altair_chart(text_column.barchart, use_container_width=True)
+
+            st.write('String length distribution:')
+            st.altair_chart(text_column.length_chart, use_container_width=True)
+
+        st.write('Most frequent values:')
+        st.write(text_column.frequent)
+
+def display_tab_text_content(file_path=None, df=None, sheet_name=None):
+    
+    text_column = TextColumn(file_path=file_path, df=df, sheet_name=sheet_name)
     
     try:
         text_column.find_text_cols()
@@ -15,15 +36,24 @@ def display_tab_text_content(file_path=None, df=None):
     selected_column = st.selectbox('Select Text Column', text_column.cols_list)
 
     if selected_column:
-        text_column.set_data(selected_column)
-        
+        status = st.empty()
+        results = st.empty()
+        estimate = copy.copy(text_column)
+        future = submit_profile(
+            slot=(st.session_state.get("session_id"), "text"),
+            job_key=(file_key(file_path, df, sheet_name), "text", selected_column),
+            profiler=text_column,
+            col_name=selected_column,
+        )
 
-        with st.expander('Text Column Summary'):
-            
-            st.table(text_column.get_summary())
-
-            
-            st.altair_chart(text_column.barchart, use_container_width=True)
+        # Show sample estimates while the exact pass runs, then replace them.
+        # Columns already in the store load quickly enough without them
+        ready = future.done() or estimate.has_stored_results(selected_column)
+        if not ready and estimate.set_estimates(selected_column):
+            with results.container():
+                display_text_summary(estimate)
 
-            st.write('Most frequent values:')
-            st.write(text_column.frequent)
\ No newline at end of file
+        profiled = wait_profile(future, selected_column, placeholder=status)
+        if profiled is not None:
+            with results.container():
+                display_text_summary(profiled)
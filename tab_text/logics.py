@@ -1,12 +1,38 @@
 import pandas as pd
 import altair as alt
 
+from utils.charts import categorical_barchart
+from utils.executor import check_cancelled
+from utils.loader import load_dataframe
+from utils.results import TextProfile
+from utils.sampling import (ESTIMATE_SAMPLE_SIZE, STATUS_ESTIMATED, STATUS_EXACT, estimate_unique, sample_serie,
+                            scale_counts)
+from utils.store import has_results, load_results, save_results
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 class TextColumn:
-    def __init__(self, file_path=None, df=None):
+    RESULT_VERSION = 4
+    RESULT_FIELDS = ['result', 'barchart', 'length_chart']
+    ESTIMATE_COUNT_FIELDS = ['n_missing', 'n_empty', 'n_space', 'n_lower', 'n_upper', 'n_alpha', 'n_digit']
+
+    def __init__(self, file_path=None, df=None, sheet_name=None):
         self.file_path = file_path
+        self.sheet_name = sheet_name
         self.df = df
         self.cols_list = []
         self.serie = None
+        self.arrow = None
+        self.cancel_token = None
+        self.status = None
+        self.result = None
+        self.n_rows = None
+        self.is_ascii = False
         self.n_unique = None
         self.n_missing = None
         self.n_empty  = None
@@ -16,15 +42,17 @@ class TextColumn:
         self.n_upper = None
         self.n_alpha = None
         self.n_digit = None
+        self.len_min = None
+        self.len_mean = None
+        self.len_max = None
+        self.lengths = pd.DataFrame(columns=['length', 'count'])
         self.barchart = alt.Chart()
+        self.length_chart = alt.Chart()
         self.frequent = pd.DataFrame(columns=['value', 'occurrence', 'percentage'])
     
     def find_text_cols(self):
         if self.df is None and self.file_path is not None:
-            try:
-                self.df = pd.read_csv(self.file_path)
-            except UnicodeDecodeError:
-                self.df = pd.read_csv(self.file_path,encoding = "ISO-8859-1")
+            self.df = load_dataframe(self.file_path, sheet_name=self.sheet_name)
         if self.df is not None:
             self.cols_list = [col for col in self.df.columns if self.df[col].dtype == 'object']
         
@@ -32,24 +60,70 @@ class TextColumn:
     def set_data(self, col_name):
         if col_name in self.cols_list:
             self.serie = self.df[col_name]
+            if self.is_serie_none():
+                return
+            if load_results(self, col_name):
+                self.result.apply_to(self)
+                return
             
-            self.convert_serie_to_text()
-            self.set_unique()
-            self.set_missing()
-            self.set_empty()
-            self.set_mode()
-            self.set_whitespace()
-            self.set_lowercase()
-            self.set_uppercase()
-            self.set_alphabet()
-            self.set_digit()
-            self.set_barchart()
-            self.set_frequent()
+            # A cancelled job stops at the next step
+            for step in (self.convert_serie_to_text, self.set_unique, self.set_missing, self.set_empty, self.set_mode,
+                         self.set_whitespace, self.set_lowercase, self.set_uppercase, self.set_alphabet,
+                         self.set_digit, self.set_lengths, self.set_frequent, self.set_barchart):
+                check_cancelled(self.cancel_token)
+                step()
+            self.n_rows = len(self.serie)
+            self.status = STATUS_EXACT
+            self.set_result()
+            save_results(self, col_name)
+
+    def has_stored_results(self, col_name):
+        
+        return has_results(self, col_name)
+
+    def set_estimates(self, col_name, sample_size=ESTIMATE_SAMPLE_SIZE, seed=0):
+        if col_name not in self.cols_list:
+            return False
+        serie = self.df[col_name]
+        if len(serie) <= sample_size:
+            return False
+
+        self.serie = sample_serie(serie, sample_size, seed)
+        for step in (self.convert_serie_to_text, self.set_missing, self.set_empty, self.set_mode, self.set_whitespace,
+                     self.set_lowercase, self.set_uppercase, self.set_alphabet, self.set_digit, self.set_lengths,
+                     self.set_frequent):
+            step()
+        scale_counts(self, self.ESTIMATE_COUNT_FIELDS, len(serie))
+        self.n_unique = estimate_unique(self.serie, len(serie))
+        self.n_rows = len(serie)
+        self.status = STATUS_ESTIMATED
+        self.set_result()
+        return True
+
+    def set_result(self):
+        self.result = TextProfile.from_profiler(self)
 
 
     def convert_serie_to_text(self):
+        # Keep missing values as real nulls, with pyarrow the strings live in
+        # one Arrow buffer that the compute kernels below work on directly
         if not self.is_serie_none():
-            self.serie = self.serie.astype(str)
+            if HAS_PYARROW:
+                self.serie = self.serie.astype('string[pyarrow]')
+                self.arrow = pa.array(self.serie.array)
+                self.is_ascii = pc.all(pc.string_is_ascii(self.arrow)).as_py() is not False
+            else:
+                self.serie = self.serie.astype('string')
+                self.arrow = None
+
+    def count_true(self, kernel, method):
+        if HAS_PYARROW and self.arrow is not None:
+            # The ASCII kernels skip UTF-8 decoding and are several times faster
+            ascii_kernel = kernel.replace('utf8_', 'ascii_')
+            if self.is_ascii and hasattr(pc, ascii_kernel):
+                kernel = ascii_kernel
+            return pc.sum(getattr(pc, kernel)(self.arrow)).as_py() or 0
+        return int(getattr(self.serie.str, method)().sum())
         
 
     def is_serie_none(self):
@@ -57,7 +131,10 @@ class TextColumn:
 
     def set_unique(self):
         if not self.is_serie_none():
-            self.n_unique = len(self.serie.unique())
+            if HAS_PYARROW and self.arrow is not None:
+                self.n_unique = pc.count_distinct(self.arrow, mode='all').as_py()
+            else:
+                self.n_unique = len(self.serie.unique())
         
 
     def set_missing(self):
@@ -67,7 +144,10 @@ class TextColumn:
 
     def set_empty(self):
         if not self.is_serie_none():
-            self.n_empty = (self.serie == '').sum()
+            if HAS_PYARROW and self.arrow is not None:
+                self.n_empty = pc.sum(pc.equal(self.arrow, '')).as_py() or 0
+            else:
+                self.n_empty = int((self.serie == '').sum())
         
 
     def set_mode(self):
@@ -77,40 +157,61 @@ class TextColumn:
 
     def set_whitespace(self):
         if not self.is_serie_none():
-            self.n_space = self.serie.str.isspace().sum()
+            self.n_space = self.count_true('utf8_is_space', 'isspace')
         
 
     def set_lowercase(self):
         if not self.is_serie_none():
-            self.n_lower = self.serie.str.islower().sum()
+            self.n_lower = self.count_true('utf8_is_lower', 'islower')
 
     def set_uppercase(self):
         if not self.is_serie_none():
-            self.n_upper = self.serie.str.isupper().sum()
+            self.n_upper = self.count_true('utf8_is_upper', 'isupper')
         
     
     def set_alphabet(self):
         if not self.is_serie_none():
-            self.n_alpha = self.serie.str.isalpha().sum()
+            self.n_alpha = self.count_true('utf8_is_alpha', 'isalpha')
         
 
     def set_digit(self):
         if not self.is_serie_none():
-            self.n_digit = self.serie.str.isdigit().sum()
+            self.n_digit = self.count_true('utf8_is_digit', 'isdigit')
         
 
-    def set_barchart(self):  
-        value_counts_df = self.serie.value_counts().reset_index()
-        value_counts_df.columns = ['value', 'count']
+    def set_lengths(self):
         if not self.is_serie_none():
-            chart = alt.Chart(value_counts_df).mark_bar().encode(
-                alt.X("value" + ':N', title="value"),
-                alt.Y('count():Q', title='Count'),
-                tooltip=['value', 'count']
-
-            )
+            if HAS_PYARROW and self.arrow is not None:
+                lengths = pc.utf8_length(self.arrow)
+                self.len_min = pc.min(lengths).as_py()
+                self.len_mean = pc.mean(lengths).as_py()
+                self.len_max = pc.max(lengths).as_py()
+                counts = pc.value_counts(pc.drop_null(lengths))
+                self.lengths = pd.DataFrame({
+                    'length': counts.field('values').to_numpy(),
+                    'count': counts.field('counts').to_numpy(),
+                })
+            else:
+                lengths = self.serie.str.len().dropna()
+                self.len_min = lengths.min() if not lengths.empty else None
+                self.len_mean = lengths.mean() if not lengths.empty else None
+                self.len_max = lengths.max() if not lengths.empty else None
+                counts = lengths.value_counts()
+                self.lengths = pd.DataFrame({'length': counts.index.astype(int), 'count': counts.values})
             
-            self.barchart = chart
+            self.lengths = self.lengths.sort_values('length', ignore_index=True)
+            self.length_chart = alt.Chart(self.lengths).mark_bar().encode(
+                alt.X('length:Q', bin=alt.Bin(maxbins=30), title='String Length'),
+                alt.Y('sum(count):Q', title='Count'),
+                tooltip=['length', 'count']
+            )
+
+    def set_barchart(self):  
+        if not self.is_serie_none():
+            # Built from the frequent values, the other values share one bar
+            if self.frequent.empty:
+                self.set_frequent()
+            self.barchart = categorical_barchart(self.frequent, self.serie.count())
 
         
       
@@ -123,18 +224,8 @@ class TextColumn:
         
 
     def get_summary(self):
-        if not self.is_serie_none():
-            summary_data = {
-                'Description': ['Number of Unique Values', 'Number of Missing Values', 'Number of Empty Values',
-                                'Mode', 'Number of Whitespace Values', 'Number of Lowercase Values',
-                                'Number of Uppercase Values', 'Number of Alphabetical Values',
-                                'Number of Digit Values'],
-                'Value': [self.n_unique, self.n_missing, self.n_empty, self.n_mode, self.n_space, self.n_lower,
-                        self.n_upper, self.n_alpha, self.n_digit]
-            }
-            summary_df = pd.DataFrame(summary_data)
-            summary_df = summary_df.astype(str)
-            return summary_df
+        if not self.is_serie_none() and self.result is not None:
+            return self.result.to_frame()
         else:
             print("Series is empty or None. Use 'set_data' to specify the column for analysis.")
-            return pd.DataFrame(columns=['Description', 'Value'])
+            return pd.DataFrame(columns=['Description', 'Value', 'Status'])
@@ -0,0 +1,30 @@
+import streamlit as st
+
+from tab_ts.logics import TimeSerie, DOWNSAMPLE_METHODS
+
+def display_tab_ts_content(file_path=None, df=None, sheet_name=None):
+    
+    time_serie_instance = TimeSerie(file_path=file_path, df=df, sheet_name=sheet_name)
+    st.session_state.time_serie_instance = time_serie_instance
+
+    try:
+        time_serie_instance.find_cols()
+    except Exception as e:
+        st.error("Unable to set time serie data are you sure you are using CSV format file?")
+        return
+
+    if not time_serie_instance.date_cols_list or not time_serie_instance.num_cols_list:
+        st.info("A time serie needs at least one datetime and one numeric column.")
+        return
+
+    date_col = st.selectbox("Select a datetime column:", time_serie_instance.date_cols_list, key="ts_date_col")
+    num_col = st.selectbox("Select a numeric column:", time_serie_instance.num_cols_list, key="ts_num_col")
+    method = st.radio("Downsampling", DOWNSAMPLE_METHODS, horizontal=True, key="ts_method")
+
+    if date_col and num_col:
+        time_serie_instance.set_data(date_col, num_col, method=method)
+        st.caption(
+            f"{time_serie_instance.n_rows} rows resampled every {time_serie_instance.interval} "
+            f"into {len(time_serie_instance.resampled)} buckets, {len(time_serie_instance.points)} points plotted."
+        )
+        st.altair_chart(time_serie_instance.chart, use_container_width=True)
@@ -0,0 +1,211 @@
+import os
+
+import numpy as np
+import pandas as pd
+import altair as alt
+
+from tab_date.logics import DateColumn
+from tab_num.logics import NumericColumn
+from utils.cache import file_hash, get_cached, set_cached
+from utils.loader import load_dataframe
+
+
+CHART_WIDTH = 800
+# Resample to at most DETAIL points per pixel, then downsample to the width
+DETAIL = 4
+DOWNSAMPLE_METHODS = ['lttb', 'minmax']
+
+# Candidate intervals from finest to coarsest with their nominal length,
+# calendar ones are bucketed on periods instead of fixed steps
+INTERVALS = [
+    ('1s', pd.Timedelta(seconds=1), None),
+    ('1min', pd.Timedelta(minutes=1), None),
+    ('5min', pd.Timedelta(minutes=5), None),
+    ('15min', pd.Timedelta(minutes=15), None),
+    ('1h', pd.Timedelta(hours=1), None),
+    ('6h', pd.Timedelta(hours=6), None),
+    ('1D', pd.Timedelta(days=1), None),
+    ('1W', pd.Timedelta(weeks=1), None),
+    ('1M', pd.Timedelta(days=30), 'M'),
+    ('1Q', pd.Timedelta(days=91), 'Q'),
+    ('1Y', pd.Timedelta(days=365), 'Y'),
+]
+
+
+def choose_interval(start, end, max_buckets):
+    
+    span = end - start
+    for name, length, period in INTERVALS:
+        if span / length <= max_buckets:
+            return name, length, period
+    return INTERVALS[-1]
+
+
+def lttb(x, y, n_out):
+    
+    # Largest-Triangle-Three-Buckets: keep the first and last points and,
+    # in every bucket between, the point forming the largest triangle with
+    # the previously kept point and the mean of the next bucket
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end].mean()
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def minmax_downsample(y, n_out):
+    
+    # Keep the lowest and the highest point of every bucket
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(np.int64)
+    selected = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            segment = y[start:end]
+            selected.extend(sorted({start + int(np.argmin(segment)), start + int(np.argmax(segment))}))
+    return np.asarray(selected, dtype=np.int64)
+
+
+class TimeSerie:
+    def __init__(self, file_path=None, df=None, sheet_name=None):
+        self.file_path = file_path
+        self.df = df
+        self.sheet_name = sheet_name
+        self.date_cols_list = []
+        self.num_cols_list = []
+        self.interval = None
+        self.n_rows = 0
+        self.resampled = pd.DataFrame(columns=['time', 'min', 'mean', 'max', 'count'])
+        self.points = pd.DataFrame(columns=['time', 'min', 'mean', 'max'])
+        self.chart = alt.Chart()
+
+    def find_cols(self):
+        
+        if self.df is None and self.file_path is not None:
+            self.df = load_dataframe(self.file_path, sheet_name=self.sheet_name)
+
+        if self.df is not None:
+            date_column = DateColumn(df=self.df)
+            date_column.find_date_cols()
+            numeric_col = NumericColumn(df=self.df)
+            numeric_col.find_num_cols()
+            self.date_cols_list = date_column.cols_list
+            self.num_cols_list = numeric_col.cols_list
+
+    def set_data(self, date_col, num_col, width=CHART_WIDTH, method='lttb'):
+        
+        if date_col not in self.date_cols_list or num_col not in self.num_cols_list:
+            raise ValueError(f"Columns '{date_col}' and '{num_col}' must be a date and a numeric column.")
+        if method not in DOWNSAMPLE_METHODS:
+            raise ValueError(f"Downsampling method '{method}' is not one of {DOWNSAMPLE_METHODS}.")
+
+        key = None
+        if self.file_path is not None and os.path.exists(self.file_path):
+            key = (file_hash(self.file_path), self.sheet_name, 'timeserie', date_col, num_col, width, method)
+            cached = get_cached(key)
+            if cached is not None:
+                self.interval, self.n_rows, self.resampled, self.points = cached
+                self.set_chart(date_col, num_col)
+                return
+
+        self.set_resampled(date_col, num_col, width)
+        self.set_points(width, method)
+        self.set_chart(date_col, num_col)
+
+        if key is not None:
+            set_cached(key, (self.interval, self.n_rows, self.resampled, self.points))
+
+    def set_resampled(self, date_col, num_col, width=CHART_WIDTH):
+        
+        date_column = DateColumn(df=self.df)
+        date_column.serie = self.df[date_col]
+        if not pd.api.types.is_datetime64_any_dtype(date_column.serie):
+            date_column.convert_serie_to_date()
+        dates = date_column.serie
+        values = self.df[num_col]
+
+        valid = dates.notna().to_numpy()
+        dates = dates[valid]
+        values = values[valid]
+        self.n_rows = len(dates)
+        if self.n_rows == 0:
+            self.resampled = pd.DataFrame(columns=['time', 'min', 'mean', 'max', 'count'])
+            return
+
+        start, end = dates.min(), dates.max()
+        self.interval, length, period = choose_interval(start, end, width * DETAIL)
+
+        # Buckets are integer codes, fixed intervals come from integer
+        # division of the timestamps, calendar ones from periods
+        if period is None:
+            stamps = dates.to_numpy(dtype='datetime64[ns]').view(np.int64)
+            origin = start.floor('D').value
+            codes = (stamps - origin) // length.value
+        else:
+            codes = dates.dt.to_period(period).array.asi8
+
+        grouped = pd.Series(values.to_numpy(), copy=False).groupby(codes, sort=True).agg(['min', 'mean', 'max', 'count'])
+        if period is None:
+            grouped.index = pd.to_datetime(origin + grouped.index.to_numpy() * length.value)
+        else:
+            # PeriodIndex.from_ordinals needs pandas 2.2, the array constructor
+            # works on the pinned version as well
+            ordinals = pd.arrays.PeriodArray(grouped.index.to_numpy(dtype=np.int64), dtype=pd.PeriodDtype(period))
+            grouped.index = pd.PeriodIndex(ordinals).start_time
+        grouped.index.name = 'time'
+        self.resampled = grouped.reset_index()
+
+    def set_points(self, width=CHART_WIDTH, method='lttb'):
+        
+        resampled = self.resampled.dropna(subset=['mean'])
+        if len(resampled) <= width:
+            self.points = resampled[['time', 'min', 'mean', 'max']].reset_index(drop=True)
+            return
+
+        x = resampled['time'].to_numpy(dtype='datetime64[ns]').view(np.int64).astype(np.float64)
+        y = resampled['mean'].to_numpy(dtype=np.float64)
+        if method == 'lttb':
+            selected = lttb(x, y, width)
+        else:
+            selected = minmax_downsample(y, width)
+
+        # The bands cover every bucket up to the next kept point, so peaks
+        # dropped from the line still show in the band
+        self.points = pd.DataFrame({
+            'time': resampled['time'].to_numpy()[selected],
+            'min': np.minimum.reduceat(resampled['min'].to_numpy(dtype=np.float64), selected),
+            'mean': y[selected],
+            'max': np.maximum.reduceat(resampled['max'].to_numpy(dtype=np.float64), selected),
+        })
+
+    def set_chart(self, date_col, num_col):
+        
+        base = alt.Chart(self.points).encode(alt.X('time:T', title=date_col))
+        band = base.mark_area(opacity=0.3).encode(
+            alt.Y('min:Q', title=num_col),
+            alt.Y2('max:Q'),
+        )
+        line = base.mark_line().encode(
+            alt.Y('mean:Q', title=num_col),
+            tooltip=['time:T', 'min:Q', 'mean:Q', 'max:Q']
+        )
+        
+        self.chart = band + line
@@ -0,0 +1,89 @@
+import unittest
+import numpy as np
+import pandas as pd
+from tab_date.logics import DateColumn
+from tab_num.logics import NumericColumn
+from tab_text.logics import TextColumn
+from utils.charts import OTHER_LABEL, categorical_barchart, spec_size, top_n_counts
+
+
+class TestCategoricalBarchart(unittest.TestCase):
+    def setUp(self):
+        
+        self.frequent = pd.DataFrame({'value': ['a', 'b', 'c', 'd'], 'occurrence': [40, 30, 20, 5]})
+
+    def test_top_n_counts(self):
+        
+        counts = top_n_counts(self.frequent, 100, top_n=2)
+        self.assertEqual(counts['value'].tolist(), ['a', 'b', OTHER_LABEL])
+        self.assertEqual(counts['count'].tolist(), [40, 30, 30])
+
+        counts = top_n_counts(self.frequent, 95, top_n=10)
+        self.assertNotIn(OTHER_LABEL, counts['value'].tolist())
+
+    def test_budget_drops_bars(self):
+        
+        frequent = pd.DataFrame({'value': [f'{i:04d}' + 'x' * 30 for i in range(20)], 'occurrence': range(40, 20, -1)})
+        full = categorical_barchart(frequent, 1000, max_bytes=10 ** 6)
+        small = categorical_barchart(frequent, 1000, max_bytes=spec_size(full) - 1)
+
+        self.assertEqual(len(full.data), 21)
+        self.assertLess(len(small.data), 21)
+        self.assertLessEqual(spec_size(small), spec_size(full) - 1)
+        self.assertEqual(small.data['count'].sum(), 1000)
+
+    def test_labels_are_unique(self):
+        
+        frequent = pd.DataFrame({
+            'value': [OTHER_LABEL, 'x' * 50 + 'a', 'x' * 50 + 'b', 'x' * 39 + '…'],
+            'occurrence': [40, 30, 20, 5],
+        })
+        counts = top_n_counts(frequent, 100, top_n=10)
+        self.assertEqual(counts['value'].nunique(), 5)
+        self.assertEqual(counts['value'].iloc[0], OTHER_LABEL)
+        self.assertEqual(counts['count'].tolist(), [40, 30, 20, 5, 5])
+
+    def test_every_call_gets_its_own_chart(self):
+        
+        chart = categorical_barchart(self.frequent, 100)
+        other = categorical_barchart(self.frequent.copy(), 100)
+        self.assertIsNot(chart, other)
+        pd.testing.assert_frame_equal(chart.data, other.data)
+
+        chart.data.loc[0, 'count'] = 0
+        self.assertEqual(categorical_barchart(self.frequent, 100).data['count'].iloc[0], 40)
+
+    def test_histogram_sends_binned_counts(self):
+        
+        values = np.random.default_rng(0).normal(size=200_000)
+        values[:10] = np.nan
+        df = pd.DataFrame({'value': values, 'other': np.arange(len(values))})
+        numeric_col = NumericColumn(df=df)
+        numeric_col.find_num_cols()
+        numeric_col.set_data('value')
+
+        self.assertEqual(len(numeric_col.histogram.data), 20)
+        self.assertEqual(numeric_col.histogram.data['count'].sum(), len(values) - 10)
+        self.assertLess(spec_size(numeric_col.histogram), 10_000)
+
+    def test_id_like_columns(self):
+        
+        n_rows = 200_000
+        df = pd.DataFrame({
+            'id': [f'id_{i}' for i in range(n_rows)],
+            'day': (pd.Timestamp('2000-01-01') + pd.to_timedelta(np.arange(n_rows), unit='h')).strftime('%Y-%m-%d'),
+        })
+        text_column = TextColumn(df=df)
+        text_column.find_text_cols()
+        text_column.set_data('id')
+        self.assertEqual(len(text_column.barchart.data), 21)
+        self.assertEqual(text_column.barchart.data['count'].sum(), n_rows)
+
+        date_column = DateColumn(df=df)
+        date_column.set_data('day')
+        self.assertEqual(len(date_column.barchart.data), 21)
+        self.assertEqual(date_column.barchart.data['count'].sum(), n_rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from tab_num.logics import NumericColumn
+from tab_text.logics import TextColumn
+from utils.cache import clear_cache
+from utils.coerce import clean_numeric_text, coerce_numeric_text, find_numeric_text_cols
+
+
+class TestNumericCoercion(unittest.TestCase):
+    def setUp(self):
+        
+        self.df = pd.DataFrame({
+            'price': ['$5.00', ' 1,234.50', '(3.50)', '12%', None, '+2', '-7', '.5'],
+            'code': ['A1', '2', '3', '4', '5', '6', '7', '8'],
+            'day': ['2022-01-01'] * 8,
+        })
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'prices.csv')
+        self.df.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        
+        clear_cache()
+        shutil.rmtree(self.temp_dir)
+
+    def test_find_numeric_text_cols(self):
+        
+        self.assertEqual(find_numeric_text_cols(self.df), ['price'])
+        self.assertEqual(find_numeric_text_cols(self.df, threshold=0.8), ['price', 'code'])
+
+    def test_parentheses_come_in_pairs(self):
+        
+        df = pd.DataFrame({'amount': ['(12)', '(12', '12)', '5']})
+        self.assertEqual(find_numeric_text_cols(df), [])
+        self.assertEqual(find_numeric_text_cols(df.iloc[[0, 3]]), ['amount'])
+        cleaned = clean_numeric_text(df['amount'])
+        self.assertEqual(cleaned.iloc[0], -12)
+        self.assertTrue(cleaned.iloc[1:3].isna().all())
+        # Missed by the sample, still not converted
+        self.assertEqual(coerce_numeric_text(df, sample_size=1)['amount'].tolist(), df['amount'].tolist())
+
+    def test_text_values_are_never_lost(self):
+        
+        # The first value is left out of the seeded sample of 500 values
+        notes = pd.Series(['see note'] + [f'{i},000' for i in range(1, 1000)])
+        df = pd.DataFrame({'amount': notes, 'count': ['1', '2'] * 500})
+        # The sample sees only numbers but the full column does not convert
+        self.assertEqual(find_numeric_text_cols(df, sample_size=500), ['amount', 'count'])
+        coerced = coerce_numeric_text(df, sample_size=500)
+        self.assertEqual(coerced['amount'].tolist(), df['amount'].tolist())
+        self.assertEqual(coerced['count'].sum(), 1500)
+
+    def test_clean_numeric_text(self):
+        
+        np.testing.assert_array_equal(
+            clean_numeric_text(self.df['price']).to_numpy(),
+            [5.0, 1234.5, -3.5, 12.0, np.nan, 2.0, -7.0, 0.5],
+        )
+
+    def test_loaded_columns_move_to_numeric_tab(self):
+        
+        numeric_col = NumericColumn(file_path=self.csv_path)
+        numeric_col.find_num_cols()
+        self.assertEqual(numeric_col.cols_list, ['price'])
+        numeric_col.set_data('price')
+        self.assertEqual(numeric_col.n_negatives, 2)
+
+        text_column = TextColumn(file_path=self.csv_path)
+        text_column.find_text_cols()
+        self.assertEqual(text_column.cols_list, ['code', 'day'])
+
+    def test_convert_serie_to_num(self):
+        
+        numeric_col = NumericColumn(df=self.df)
+        numeric_col.serie = self.df['price']
+        numeric_col.convert_serie_to_num()
+        self.assertEqual(numeric_col.serie.sum(), 1243.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
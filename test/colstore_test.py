@@ -0,0 +1,168 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import numpy as np
+import pandas as pd
+from tab_date.logics import DateColumn
+from tab_df.logics import Dataset
+from tab_num.logics import NumericColumn
+from tab_text.logics import TextColumn
+from tab_ts.logics import TimeSerie
+from utils.cache import clear_cache
+from utils.colstore import numeric_store_dir, read_numeric_store, write_numeric_store
+from utils.loader import columnar_cache_path, load_dataframe, prune_cache_dir
+from utils.cache import file_hash
+
+
+class TestNumericStore(unittest.TestCase):
+    def setUp(self):
+        
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'data.csv')
+        self.expected = pd.DataFrame({
+            'amount': [1.5, np.nan, -3.0, 0.0],
+            'count': [1, 2, 3, 4],
+            'name': ['a', 'b', np.nan, 'd'],
+        })
+        self.expected.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        
+        clear_cache()
+        shutil.rmtree(self.temp_dir)
+
+    def test_numeric_columns_are_memory_mapped(self):
+        
+        df = load_dataframe(self.csv_path)
+        pd.testing.assert_frame_equal(df.copy(), self.expected)
+        self.assertIsInstance(df['amount'].values, np.memmap)
+        self.assertIsInstance(df['count'].values, np.memmap)
+        self.assertNotIsInstance(df['name'].values, np.memmap)
+
+    def test_store_is_shared_after_cache_reset(self):
+        
+        first = load_dataframe(self.csv_path)
+        clear_cache()
+        second = load_dataframe(self.csv_path)
+        self.assertIsNot(first, second)
+        self.assertEqual(first['amount'].values.filename, second['amount'].values.filename)
+
+    def test_numeric_column_reads_store(self):
+        
+        numeric_col = NumericColumn(file_path=self.csv_path)
+        numeric_col.find_num_cols()
+        numeric_col.set_data('amount')
+        self.assertIsInstance(numeric_col.serie.values, np.memmap)
+        self.assertEqual(numeric_col.n_missing, 1)
+        self.assertEqual(numeric_col.n_negatives, 1)
+
+    def assert_mapped(self, df, mapped=None):
+        
+        store_dir = numeric_store_dir(columnar_cache_path(self.csv_path, file_hash(self.csv_path)))
+        for col in ('amount', 'count'):
+            self.assertIsInstance(df[col].values, np.memmap)
+            self.assertEqual(os.path.dirname(df[col].values.filename), os.path.abspath(store_dir))
+            if mapped is not None:
+                self.assertTrue(np.shares_memory(df[col].values, mapped[col]))
+
+    def test_frame_stays_mapped_after_every_tab(self):
+        
+        n_rows = 2000
+        pd.DataFrame({
+            'amount': np.linspace(-1, 1, n_rows),
+            'count': np.arange(n_rows) % 7,
+            'name': ['a', 'b'] * (n_rows // 2),
+            'day': pd.date_range('2020-01-01', periods=n_rows, freq='D').strftime('%Y-%m-%d'),
+        }).to_csv(self.csv_path, index=False)
+
+        for attempt in range(2):
+            # The second run builds the frame from the store and the parquet cache
+            clear_cache()
+            df = load_dataframe(self.csv_path)
+            self.assert_mapped(df)
+            mapped = {col: df[col].values for col in ('amount', 'count')}
+
+            dataset = Dataset(self.csv_path)
+            dataset.set_df()
+            dataset.set_data()
+            numeric_col = NumericColumn(file_path=self.csv_path)
+            numeric_col.find_num_cols()
+            numeric_col.set_data('amount')
+            numeric_col.set_grouped('amount', 'name')
+            numeric_col.set_correlation()
+            text_column = TextColumn(file_path=self.csv_path)
+            text_column.find_text_cols()
+            text_column.set_data('name')
+            date_column = DateColumn(file_path=self.csv_path)
+            date_column.find_date_cols()
+            date_column.set_data('day')
+            time_serie = TimeSerie(file_path=self.csv_path)
+            time_serie.find_cols()
+            time_serie.set_data('day', 'amount')
+
+            self.assertIs(load_dataframe(self.csv_path), df)
+            self.assert_mapped(df, mapped)
+
+    def test_numeric_columns_are_not_read_again(self):
+        
+        load_dataframe(self.csv_path)
+        clear_cache()
+        with mock.patch('utils.loader.pd.read_parquet', wraps=pd.read_parquet) as read_parquet:
+            df = load_dataframe(self.csv_path)
+        self.assertEqual(read_parquet.call_args.kwargs['columns'], ['name'])
+        pd.testing.assert_frame_equal(df[['amount', 'count']].copy(), self.expected[['amount', 'count']])
+        self.assertEqual(df['name'].isna().tolist(), self.expected['name'].isna().tolist())
+        self.assert_mapped(df)
+
+    def test_unmapped_frame_is_rebuilt(self):
+        
+        df = load_dataframe(self.csv_path)
+        df['amount'] = df['amount'].to_numpy().copy()
+        reloaded = load_dataframe(self.csv_path)
+        self.assertIsNot(reloaded, df)
+        self.assert_mapped(reloaded)
+
+    def test_prune_cache_dir(self):
+        
+        paths = []
+        for i in range(3):
+            csv_path = os.path.join(self.temp_dir, f'data_{i}.csv')
+            pd.DataFrame({'value': np.arange(10_000, dtype=np.float64) + i}).to_csv(csv_path, index=False)
+            load_dataframe(csv_path)
+            cache_path = columnar_cache_path(csv_path, file_hash(csv_path))
+            os.utime(cache_path, (i, i))
+            paths.append(cache_path)
+
+        cache_dir = os.path.dirname(paths[0])
+        prune_cache_dir(cache_dir, max_bytes=1, keep=(paths[0],))
+        self.assertTrue(os.path.exists(paths[0]))
+        self.assertTrue(os.path.isdir(numeric_store_dir(paths[0])))
+        for cache_path in paths[1:]:
+            self.assertFalse(os.path.exists(cache_path))
+            self.assertFalse(os.path.exists(numeric_store_dir(cache_path)))
+
+    def test_concurrent_writes(self):
+        
+        df = pd.DataFrame({f'col_{i}': np.arange(100_000, dtype=np.float64) + i for i in range(8)})
+        for attempt in range(5):
+            store_dir = os.path.join(self.temp_dir, f'store_{attempt}')
+            barrier = threading.Barrier(8)
+
+            def write(_):
+                barrier.wait()
+                write_numeric_store(df, store_dir)
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(write, range(8)))
+
+            arrays = read_numeric_store(store_dir, len(df))
+            for col in df.columns:
+                np.testing.assert_array_equal(arrays[col], df[col].to_numpy())
+        self.assertFalse([name for name in os.listdir(self.temp_dir) if name.endswith('.tmp')])
+
+if __name__ == '__main__':
+    unittest.main()
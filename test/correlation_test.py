@@ -0,0 +1,108 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from tab_num.logics import NumericColumn, pairwise_correlation
+from utils.charts import spec_size
+
+
+class TestCorrelation(unittest.TestCase):
+    def setUp(self):
+        
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame(rng.normal(size=(500, 7)), columns=[f'col_{i}' for i in range(7)])
+        data['col_1'] += data['col_0']
+        data.loc[rng.choice(500, 60, replace=False), 'col_2'] = np.nan
+        data['name'] = 'x'
+        self.data = data
+        self.temp_csv_path = 'temp_test_corr.csv'
+        data.to_csv(self.temp_csv_path, index=False)
+
+    def tearDown(self):
+        
+        os.remove(self.temp_csv_path)
+
+    def test_pairwise_matches_pandas(self):
+        
+        numeric = self.data.drop(columns='name')
+        corr, counts = pairwise_correlation(numeric.to_numpy(), block_size=3)
+        np.testing.assert_allclose(corr, numeric.corr().to_numpy(), atol=1e-10)
+        self.assertEqual(counts[2, 0], 440)
+        self.assertEqual(counts[0, 0], 500)
+
+    def test_set_correlation_spearman(self):
+        
+        numeric_col = NumericColumn(df=self.data)
+        numeric_col.find_num_cols()
+        numeric_col.set_correlation(method='spearman', block_size=2)
+        
+        expected = self.data.drop(columns='name').corr(method='spearman')
+        result = numeric_col.correlation.pivot(index='column_x', columns='column_y', values='correlation')
+        self.assertAlmostEqual(result.loc['col_0', 'col_1'], expected.loc['col_0', 'col_1'])
+
+    def test_set_correlation_sample_is_cached(self):
+        
+        numeric_col = NumericColumn(file_path=self.temp_csv_path)
+        numeric_col.find_num_cols()
+        numeric_col.set_correlation(sample_size=200)
+        first = numeric_col.correlation
+        self.assertTrue(first['ci_low'].notna().any())
+        self.assertTrue((first['n'] <= 200).all())
+
+        other_col = NumericColumn(file_path=self.temp_csv_path)
+        other_col.find_num_cols()
+        other_col.set_correlation(sample_size=200)
+        pd.testing.assert_frame_equal(other_col.correlation, first)
+
+        # A session changing its result leaves the cached one alone
+        other_col.correlation.loc[:, 'correlation'] = 0.0
+        other_col.heatmap.data.loc[:, 'correlation'] = 0.0
+        third_col = NumericColumn(file_path=self.temp_csv_path)
+        third_col.find_num_cols()
+        third_col.set_correlation(sample_size=200)
+        pd.testing.assert_frame_equal(third_col.correlation, first)
+        self.assertTrue((third_col.heatmap.data['correlation'] != 0).any())
+
+    def test_heatmap_fits_budget(self):
+        
+        rng = np.random.default_rng(1)
+        wide = pd.DataFrame(rng.normal(size=(300, 200)), columns=[f'col_{i}' for i in range(200)])
+        wide['col_150'] = wide['col_3'] + 0.01 * rng.normal(size=300)
+        numeric_col = NumericColumn(df=wide)
+        numeric_col.find_num_cols()
+        numeric_col.set_correlation()
+        numeric_col.set_heatmap(max_bytes=50_000)
+
+        self.assertLess(len(numeric_col.heatmap_cols), 200)
+        self.assertLessEqual(spec_size(numeric_col.heatmap), 50_000)
+        # The strongest pair is always drawn
+        self.assertIn('col_3', numeric_col.heatmap_cols)
+        self.assertIn('col_150', numeric_col.heatmap_cols)
+        self.assertEqual(numeric_col.get_top_pairs(1)[['column_x', 'column_y']].values.tolist(),
+                         [['col_3', 'col_150']])
+        matrix = numeric_col.get_correlation_matrix(numeric_col.heatmap_cols)
+        self.assertEqual(matrix.shape, (len(numeric_col.heatmap_cols),) * 2)
+
+    def test_mixed_column_names(self):
+        
+        # Headers mixing numbers and text can't be sorted or compared
+        data = self.data.drop(columns='name').rename(columns={'col_0': 0, 'col_2': 2})
+        numeric_col = NumericColumn(df=data)
+        numeric_col.find_num_cols()
+        numeric_col.set_correlation()
+
+        self.assertEqual(numeric_col.get_top_pairs(1)[['column_x', 'column_y']].values.tolist(), [[0, 'col_1']])
+        matrix = numeric_col.get_correlation_matrix([2, 'col_1'])
+        self.assertEqual(matrix.index.tolist(), [2, 'col_1'])
+        self.assertAlmostEqual(matrix.loc[2, 'col_1'], data[2].corr(data['col_1']))
+
+    def test_set_correlation_invalid_method(self):
+        
+        numeric_col = NumericColumn(df=self.data)
+        numeric_col.find_num_cols()
+        with self.assertRaises(ValueError):
+            numeric_col.set_correlation(method='kendall')
+
+
+if __name__ == '__main__':
+    unittest.main()
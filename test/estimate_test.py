@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from tab_date.logics import DateColumn
+from tab_num.logics import NumericColumn
+from tab_text.logics import TextColumn
+from utils import store
+from utils.cache import clear_cache
+from utils.sampling import estimate_unique, sample_serie
+
+
+class TestEstimates(unittest.TestCase):
+    def setUp(self):
+        
+        rng = np.random.default_rng(0)
+        amount = rng.normal(10, 3, 100_000)
+        amount[rng.choice(100_000, 5_000, replace=False)] = np.nan
+        self.df = pd.DataFrame({
+            'amount': amount,
+            'name': rng.choice(['alpha', 'BETA', '42', ' '], 100_000),
+            'day': pd.Series(pd.date_range('2020-01-01', periods=1_000)).dt.strftime('%Y-%m-%d').sample(
+                100_000, replace=True, random_state=0).to_numpy(),
+        })
+
+    def test_numeric_estimates(self):
+        
+        numeric_col = NumericColumn(df=self.df)
+        numeric_col.find_num_cols()
+        self.assertTrue(numeric_col.set_estimates('amount', sample_size=10_000))
+        self.assertEqual(numeric_col.status, 'estimated')
+        self.assertEqual(len(numeric_col.serie), 10_000)
+        self.assertAlmostEqual(numeric_col.n_missing, 5_000, delta=600)
+
+        low, high = numeric_col.intervals['col_mean']
+        self.assertLess(low, self.df['amount'].mean())
+        self.assertGreater(high, self.df['amount'].mean())
+        self.assertTrue(numeric_col.get_summary()['Value'].iloc[2].startswith('≈'))
+
+        numeric_col.set_data('amount')
+        self.assertEqual(numeric_col.status, 'exact')
+        self.assertEqual(numeric_col.n_missing, 5_000)
+        self.assertEqual(set(numeric_col.get_summary()['Status']), {'exact'})
+
+    def test_small_column_skips_estimates(self):
+        
+        numeric_col = NumericColumn(df=self.df.head(100))
+        numeric_col.find_num_cols()
+        self.assertFalse(numeric_col.set_estimates('amount', sample_size=1_000))
+        self.assertIsNone(numeric_col.status)
+
+    def test_text_and_date_estimates(self):
+        
+        text_column = TextColumn(df=self.df)
+        text_column.find_text_cols()
+        self.assertTrue(text_column.set_estimates('name', sample_size=10_000))
+        self.assertEqual(text_column.n_unique, 4)
+        self.assertAlmostEqual(text_column.n_digit, 25_000, delta=1_500)
+        self.assertEqual(len(text_column.frequent), 4)
+
+        date_column = DateColumn(df=self.df)
+        date_column.find_date_cols()
+        self.assertTrue(date_column.set_estimates('day', sample_size=10_000))
+        self.assertAlmostEqual(date_column.n_unique, 1_000, delta=100)
+        self.assertEqual(set(date_column.get_summary()['Status']), {'estimated'})
+
+    def test_stored_results_are_detected(self):
+        
+        temp_dir = tempfile.mkdtemp()
+        try:
+            store.set_store(store.ResultStore(os.path.join(temp_dir, 'results.sqlite')))
+            csv_path = os.path.join(temp_dir, 'data.csv')
+            self.df.to_csv(csv_path, index=False)
+            for profiler, col_name in ((NumericColumn, 'amount'), (TextColumn, 'name'), (DateColumn, 'day')):
+                column = profiler(file_path=csv_path)
+                column.df = self.df
+                column.cols_list = [col_name]
+                self.assertFalse(column.has_stored_results(col_name))
+                column.set_data(col_name)
+                self.assertTrue(column.has_stored_results(col_name))
+        finally:
+            store.set_store(None)
+            clear_cache()
+            shutil.rmtree(temp_dir)
+
+    def test_estimate_unique(self):
+        
+        serie = pd.Series(np.arange(50_000))
+        self.assertEqual(estimate_unique(sample_serie(serie, 1_000), len(serie)), 50_000)
+        serie = pd.Series(np.arange(50_000) % 10)
+        self.assertEqual(estimate_unique(sample_serie(serie, 1_000), len(serie)), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
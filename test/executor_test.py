@@ -0,0 +1,175 @@
+import threading
+import unittest
+import pandas as pd
+from tab_num.logics import NumericColumn
+from utils import executor
+from utils.executor import (CancelToken, JobCancelled, ProfileExecutor, check_cancelled, file_key, run_profile,
+                            submit_profile, wait_profile)
+
+
+class Placeholder:
+    def __init__(self):
+        self.errors = []
+
+    def caption(self, body):
+        pass
+
+    def empty(self):
+        pass
+
+    def error(self, body):
+        self.errors.append(body)
+
+
+class BlockingProfiler:
+    def __init__(self, release):
+        self.release = release
+        self.cancel_token = None
+
+    def set_data(self, col_name):
+        
+        self.release.wait(5)
+        check_cancelled(self.cancel_token)
+        if col_name == 'broken':
+            raise KeyError(col_name)
+
+
+class TestProfileExecutor(unittest.TestCase):
+    def setUp(self):
+        
+        self.executor = ProfileExecutor(max_workers=1)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        
+        self.release.set()
+        self.executor.shutdown()
+
+    def blocking_job(self, token):
+        
+        self.release.wait(5)
+        check_cancelled(token)
+        return 'done'
+
+    def test_same_request_is_merged(self):
+        
+        first = self.executor.submit(('session_1', 'num'), ('file', 'num', 'a'), self.blocking_job)
+        second = self.executor.submit(('session_2', 'num'), ('file', 'num', 'a'), self.blocking_job)
+        repeat = self.executor.submit(('session_1', 'num'), ('file', 'num', 'a'), self.blocking_job)
+        self.assertIs(first, second)
+        self.assertIs(first, repeat)
+        self.assertEqual(len(self.executor.jobs), 1)
+
+    def test_finished_job_can_be_requested_again(self):
+        
+        self.release.set()
+        first = self.executor.submit(('session_1', 'num'), ('file', 'num', 'a'), self.blocking_job)
+        self.assertEqual(first.result(timeout=5), 'done')
+        again = self.executor.submit(('session_1', 'num'), ('file', 'num', 'a'), self.blocking_job)
+        self.assertEqual(again.result(timeout=5), 'done')
+
+    def test_new_selection_cancels_stale_job(self):
+        
+        running = self.executor.submit(('session_1', 'num'), ('file', 'num', 'a'), self.blocking_job)
+        queued = self.executor.submit(('session_1', 'num'), ('file', 'num', 'b'), self.blocking_job)
+        latest = self.executor.submit(('session_1', 'num'), ('file', 'num', 'c'), self.blocking_job)
+
+        self.assertTrue(queued.cancelled())
+        self.release.set()
+        with self.assertRaises(JobCancelled):
+            running.result(timeout=5)
+        self.assertEqual(latest.result(timeout=5), 'done')
+
+    def test_shared_job_survives_one_session_moving_on(self):
+        
+        shared = self.executor.submit(('session_1', 'num'), ('file', 'num', 'a'), self.blocking_job)
+        self.executor.submit(('session_2', 'num'), ('file', 'num', 'a'), self.blocking_job)
+        self.executor.submit(('session_1', 'num'), ('file', 'num', 'b'), self.blocking_job)
+        self.release.set()
+        self.assertEqual(shared.result(timeout=5), 'done')
+
+    def test_finished_slot_does_not_release_newer_job(self):
+        
+        self.release.set()
+        finished = self.executor.submit(('session_1', 'num'), ('file', 'num', 'a'), self.blocking_job)
+        self.assertEqual(finished.result(timeout=5), 'done')
+        self.release.clear()
+        # Done callbacks run right after the result is set
+        for _ in range(50):
+            if not self.executor.slots:
+                break
+            threading.Event().wait(0.01)
+
+        newer = self.executor.submit(('session_2', 'num'), ('file', 'num', 'a'), self.blocking_job)
+        self.assertIsNot(newer, finished)
+        self.executor.submit(('session_1', 'num'), ('file', 'num', 'b'), self.blocking_job)
+        self.release.set()
+        self.assertEqual(newer.result(timeout=5), 'done')
+
+    def test_wait_on_cancelled_job(self):
+        
+        self.executor.submit(('session_1', 'num'), ('file', 'num', 'a'), self.blocking_job)
+        queued = self.executor.submit(('session_1', 'num'), ('file', 'num', 'b'), self.blocking_job)
+        self.executor.submit(('session_1', 'num'), ('file', 'num', 'c'), self.blocking_job)
+        self.assertIsNone(wait_profile(queued, 'b'))
+
+    def test_file_key_includes_sheet(self):
+        
+        self.assertNotEqual(file_key(__file__, sheet_name='a'), file_key(__file__, sheet_name='b'))
+
+    def test_frames_without_file_are_not_merged(self):
+        
+        df = pd.DataFrame({'a': [1]})
+        self.assertNotEqual(file_key(df=df), file_key(df=df))
+
+    def use_executor(self):
+        
+        previous = executor._executor
+        executor._executor = self.executor
+        self.addCleanup(setattr, executor, '_executor', previous)
+
+    def test_cancelled_job_clears_token(self):
+        
+        self.use_executor()
+        profiler = BlockingProfiler(self.release)
+        running = submit_profile(('session_1', 'num'), ('file', 'num', 'a'), profiler, 'a')
+        submit_profile(('session_1', 'num'), ('file', 'num', 'b'), BlockingProfiler(self.release), 'b')
+        self.assertEqual(list(self.executor.jobs), [('file', 'num', 'b')])
+        self.assertEqual(list(self.executor.slots.values())[0].job_key, ('file', 'num', 'b'))
+        self.release.set()
+        self.assertIsNone(wait_profile(running, 'a'))
+        self.assertIsNone(profiler.cancel_token)
+
+    def test_failed_job_shows_error(self):
+        
+        self.use_executor()
+        self.release.set()
+        future = submit_profile(('session_1', 'num'), ('file', 'num', 'broken'), BlockingProfiler(self.release),
+                                'broken')
+        placeholder = Placeholder()
+        self.assertIsNone(wait_profile(future, 'broken', placeholder=placeholder))
+        self.assertEqual(len(placeholder.errors), 1)
+        self.assertIn("'broken'", placeholder.errors[0])
+
+    def test_cancelled_profiler_stops(self):
+        
+        token = CancelToken()
+        token.cancel()
+        numeric_col = NumericColumn(df=pd.DataFrame({'a': [1, 2, 3]}))
+        numeric_col.find_num_cols()
+        numeric_col.cancel_token = token
+        with self.assertRaises(JobCancelled):
+            numeric_col.set_data('a')
+        self.assertIsNone(numeric_col.n_unique)
+
+    def test_run_profile(self):
+        
+        numeric_col = NumericColumn(df=pd.DataFrame({'a': [1, 2, 2]}))
+        numeric_col.find_num_cols()
+        result = run_profile(('session_1', 'num'), ('frame', 'num', 'a'), numeric_col, 'a')
+        self.assertEqual(result.n_unique, 2)
+        self.assertIsNone(result.cancel_token)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import numpy as np
+import pandas as pd
+from tab_num.logics import NumericColumn
+
+
+class TestGroupedNumericColumn(unittest.TestCase):
+    def setUp(self):
+        
+        self.df = pd.DataFrame({
+            'store': ['a', 'a', 'a', 'b', 'b', 'c', 'd', None],
+            'sales': [1.0, -2.0, 0.0, 4.0, np.nan, 6.0, 0.0, 8.0],
+        })
+        self.numeric_col = NumericColumn(df=self.df)
+        self.numeric_col.find_num_cols()
+
+    def test_find_group_cols(self):
+        
+        self.assertEqual(self.numeric_col.group_cols_list, ['store'])
+
+    def test_set_grouped_matches_per_group(self):
+        
+        self.numeric_col.set_grouped('sales', 'store', top_k=10)
+        grouped = self.numeric_col.grouped
+
+        self.assertEqual(len(grouped), 5)
+        store_a = grouped.loc['a']
+        self.assertEqual(store_a['count'], 3)
+        self.assertEqual(store_a['zeros'], 1)
+        self.assertEqual(store_a['negatives'], 1)
+        self.assertAlmostEqual(store_a['mean'], -1 / 3)
+        self.assertAlmostEqual(store_a['std'], self.df.loc[:2, 'sales'].std())
+        self.assertEqual(grouped.loc['b', 'missing'], 1)
+        self.assertEqual(grouped.loc['b', 'median'], 4.0)
+
+    def test_set_grouped_rolls_up_other(self):
+        
+        self.numeric_col.set_grouped('sales', 'store', top_k=2)
+        grouped = self.numeric_col.grouped
+
+        self.assertEqual(grouped.index.tolist(), ['a', 'b', 'other'])
+        self.assertEqual(grouped.loc['other', 'count'], 3)
+        self.assertEqual(grouped.loc['other', 'max'], 8.0)
+        self.assertEqual(grouped['count'].sum() + grouped['missing'].sum(), len(self.df))
+
+    def test_set_grouped_real_other_group(self):
+        
+        df = pd.DataFrame({'store': ['other'] * 3 + ['a'] * 2 + ['b', 'c'], 'sales': range(7)})
+        numeric_col = NumericColumn(df=df)
+        numeric_col.find_num_cols()
+        numeric_col.set_grouped('sales', 'store', top_k=2)
+        grouped = numeric_col.grouped
+
+        self.assertTrue(grouped.index.is_unique)
+        self.assertEqual(grouped.loc['other', 'count'], 3)
+        self.assertEqual(grouped.loc['(other)', 'count'], 2)
+
+    def test_set_grouped_labels_print_alike(self):
+        
+        df = pd.DataFrame({'store': [1, 1, 1, '1', '1', np.nan, 'nan'], 'sales': range(7)})
+        numeric_col = NumericColumn(df=df)
+        numeric_col.find_num_cols()
+        numeric_col.set_grouped('sales', 'store')
+        grouped = numeric_col.grouped
+
+        self.assertTrue(grouped.index.is_unique)
+        self.assertEqual(grouped['count'].tolist(), [3, 2, 1, 1])
+        self.assertEqual(grouped.loc['1', 'max'], 2)
+        self.assertEqual(grouped.loc['(1)', 'max'], 4)
+
+    def test_set_grouped_invalid_column(self):
+        
+        with self.assertRaises(ValueError):
+            self.numeric_col.set_grouped('store', 'sales')
+
+
+if __name__ == '__main__':
+    unittest.main()
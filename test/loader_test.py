@@ -0,0 +1,201 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from openpyxl import Workbook
+from utils.decompress import HAS_ZSTANDARD, ThreadedReader, detect_compression
+from utils import cache
+from utils.loader import is_excel, list_sheets, load_dataframe, read_csv, read_excel
+
+
+class TestLoader(unittest.TestCase):
+    def setUp(self):
+        
+        self.temp_dir = tempfile.mkdtemp()
+        self.xlsx_path = os.path.join(self.temp_dir, 'workbook.xlsx')
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = 'sales'
+        sheet.append(['store', 'amount'])
+        for i in range(25):
+            sheet.append([f'store_{i % 3}', i * 1.5])
+        other = workbook.create_sheet('stock')
+        other.append(['item', 'count'])
+        other.append(['pen', 4])
+        workbook.save(self.xlsx_path)
+
+        self.csv_path = os.path.join(self.temp_dir, 'latin.csv')
+        with open(self.csv_path, 'wb') as f:
+            f.write('name,value\ncafé,1\nnaïve,2\n'.encode('ISO-8859-1'))
+
+    def tearDown(self):
+        
+        shutil.rmtree(self.temp_dir)
+
+    def test_list_sheets(self):
+        
+        self.assertTrue(is_excel(self.xlsx_path))
+        self.assertFalse(is_excel(self.csv_path))
+        self.assertEqual(list_sheets(self.xlsx_path), ['sales', 'stock'])
+
+    def test_read_excel_in_chunks(self):
+        
+        df = read_excel(self.xlsx_path, chunk_rows=10)
+        self.assertEqual(df.shape, (25, 2))
+        self.assertEqual(df['amount'].dtype, 'float64')
+        pd.testing.assert_frame_equal(df, pd.read_excel(self.xlsx_path, engine='openpyxl'))
+
+    def test_read_excel_chunk_types(self):
+        
+        xlsx_path = os.path.join(self.temp_dir, 'types.xlsx')
+        workbook = Workbook()
+        workbook.active.append(['sparse', 'mixed', 2020])
+        for i in range(30):
+            # sparse is empty in the second chunk, mixed turns to text in the last one
+            workbook.active.append([None if 10 <= i < 20 else i, i if i < 20 else f'code_{i}', i * 0.5])
+        workbook.save(xlsx_path)
+
+        df = read_excel(xlsx_path, chunk_rows=10)
+        self.assertEqual(df.columns.tolist(), ['sparse', 'mixed', 2020])
+        self.assertEqual(df['sparse'].dtype, 'float64')
+        self.assertEqual(df['sparse'].isna().sum(), 10)
+        self.assertEqual(df['mixed'].tolist(), list(range(20)) + [f'code_{i}' for i in range(20, 30)])
+        self.assertEqual(df[2020].sum(), sum(i * 0.5 for i in range(30)))
+
+    def test_read_excel_duplicate_headers(self):
+        
+        xlsx_path = os.path.join(self.temp_dir, 'duplicates.xlsx')
+        workbook = Workbook()
+        workbook.active.append(['amount', 'amount', None, 'amount'])
+        workbook.active.append([1, 2, 3, 4])
+        workbook.save(xlsx_path)
+
+        df = read_excel(xlsx_path)
+        self.assertEqual(df.columns.tolist(), ['amount', 'amount.1', 'Unnamed: 2', 'amount.2'])
+        pd.testing.assert_frame_equal(df, pd.read_excel(xlsx_path, engine='openpyxl'))
+
+    def test_cache_is_bounded_by_bytes(self):
+        
+        cache.clear_cache()
+        frame = pd.DataFrame({'value': range(10_000)})
+        size = cache.value_size(frame)
+        for i in range(5):
+            cache.set_cached(('frame', i), frame, max_bytes=3 * size)
+        self.assertLessEqual(cache.cached_bytes(), 3 * size)
+        self.assertIsNone(cache.get_cached(('frame', 0)))
+        self.assertIs(cache.get_cached(('frame', 4)), frame)
+
+        cache.set_cached(('frame', 'big'), frame, max_bytes=size - 1)
+        self.assertIsNone(cache.get_cached(('frame', 'big')))
+        cache.clear_cache()
+
+    def test_file_hashes_are_bounded(self):
+        
+        cache.clear_cache()
+        file_path = os.path.join(self.temp_dir, 'rewritten.csv')
+        for i in range(cache.MAX_CACHED_HASHES + 10):
+            with open(file_path, 'w') as f:
+                f.write(f'value\n{i}\n')
+            os.utime(file_path, ns=(i, i))
+            cache.file_hash(file_path)
+        self.assertEqual(len(cache._hashes), cache.MAX_CACHED_HASHES)
+        cache.clear_cache()
+
+    def test_load_dataframe_sheet(self):
+        
+        df = load_dataframe(self.xlsx_path, sheet_name='stock')
+        self.assertEqual(df.to_dict('list'), {'item': ['pen'], 'count': [4]})
+
+    def test_load_dataframe_is_cached(self):
+        
+        df = load_dataframe(self.csv_path)
+        self.assertEqual(df['name'].tolist(), ['café', 'naïve'])
+        self.assertIs(load_dataframe(self.csv_path), df)
+
+
+class FailingSource(io.BytesIO):
+    def read(self, size=-1):
+        
+        raise OSError("corrupt stream")
+
+
+class TestCompressedCsv(unittest.TestCase):
+    def setUp(self):
+        
+        self.temp_dir = tempfile.mkdtemp()
+        self.df = pd.DataFrame({'name': [f'item_{i}' for i in range(5000)], 'value': range(5000)})
+        self.raw = self.df.to_csv(index=False).encode()
+
+    def tearDown(self):
+        
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, data):
+        
+        file_path = os.path.join(self.temp_dir, name)
+        with open(file_path, 'wb') as f:
+            f.write(data)
+        return file_path
+
+    def test_read_compressed_by_magic_bytes(self):
+        
+        compressors = {'gzip': gzip.compress, 'bz2': bz2.compress, 'xz': lzma.compress}
+        if HAS_ZSTANDARD:
+            import zstandard
+            compressors['zstd'] = zstandard.ZstdCompressor().compress
+        for compression, compress in compressors.items():
+            # No extension, the format comes from the content
+            file_path = self.write(f'upload_{compression}', compress(self.raw))
+            self.assertEqual(detect_compression(file_path), compression)
+            pd.testing.assert_frame_equal(read_csv(file_path), self.df)
+
+        self.assertIsNone(detect_compression(self.write('plain.csv', self.raw)))
+        self.assertIsNone(detect_compression(self.write('bzh.csv', b'BZh,value\nBZhx,1\n')))
+        self.assertEqual(detect_compression(self.write('fast.bz2', bz2.compress(self.raw, 1))), 'bz2')
+
+    @unittest.skipUnless(HAS_ZSTANDARD, 'zstandard is not installed')
+    def test_read_multi_frame_zstd(self):
+        
+        import zstandard
+        compressor = zstandard.ZstdCompressor()
+        half = len(self.raw) // 2
+        half = self.raw.index(b'\n', half) + 1
+        # Two frames one after the other, like zstd -T0 or cat a.zst b.zst
+        frames = compressor.compress(self.raw[:half]) + compressor.compress(self.raw[half:])
+        file_path = self.write('frames.csv.zst', frames)
+        pd.testing.assert_frame_equal(read_csv(file_path), self.df)
+
+    def test_compressed_encoding_fallback(self):
+        
+        file_path = self.write('latin.csv.gz', gzip.compress('name\ncafé\n'.encode('ISO-8859-1')))
+        self.assertEqual(read_csv(file_path)['name'].tolist(), ['café'])
+
+    def test_load_compressed_dataframe(self):
+        
+        file_path = self.write('data.csv.xz', lzma.compress(self.raw))
+        pd.testing.assert_frame_equal(load_dataframe(file_path).copy(), self.df)
+
+    def test_threaded_reader_blocks(self):
+        
+        reader = ThreadedReader(io.BytesIO(self.raw), block_size=1000, max_blocks=2)
+        with io.BufferedReader(reader) as stream:
+            self.assertEqual(stream.read(10), self.raw[:10])
+            # The thread only decompresses a couple of blocks ahead
+            self.assertLessEqual(reader.blocks.qsize(), 2)
+            self.assertEqual(stream.read(), self.raw[10:])
+        self.assertFalse(reader.thread.is_alive())
+
+    def test_threaded_reader_raises_errors(self):
+        
+        with self.assertRaises(OSError):
+            with io.BufferedReader(ThreadedReader(FailingSource())) as stream:
+                stream.read()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+import pandas as pd
+from tab_df.logics import Dataset, co_missing_counts, pack_null_masks, popcount, POPCOUNT_TABLE
+
+
+class TestNullity(unittest.TestCase):
+    def setUp(self):
+        
+        rng = np.random.default_rng(0)
+        n_rows = 10_001
+        self.df = pd.DataFrame({
+            'a': np.where(rng.random(n_rows) < 0.1, np.nan, 1.0),
+            'b': np.where(rng.random(n_rows) < 0.3, None, 'x'),
+            'c': np.arange(n_rows),
+        })
+        self.df.loc[self.df['a'].isna(), 'b'] = None
+        self.dataset = Dataset(None)
+        self.dataset.df = self.df
+
+    def test_pack_null_masks_chunks(self):
+        
+        masks = pack_null_masks(self.df, chunk_rows=1000)
+
+        self.assertEqual(masks.shape, (3, (len(self.df) + 7) // 8))
+        for i, col in enumerate(self.df.columns):
+            unpacked = np.unpackbits(masks[i])[:len(self.df)].astype(bool)
+            np.testing.assert_array_equal(unpacked, self.df[col].isna().to_numpy())
+
+    def test_popcount_table(self):
+        
+        values = np.arange(256, dtype=np.uint8)
+        np.testing.assert_array_equal(popcount(values), POPCOUNT_TABLE[values])
+
+    def test_set_missing(self):
+        
+        self.dataset.set_missing()
+        expected = self.df.isna().sum()
+
+        self.assertEqual(self.dataset.n_missing, expected.sum())
+        self.assertEqual(self.dataset.null_counts['Missing Values'].tolist(), expected.tolist())
+        self.assertAlmostEqual(self.dataset.null_counts['Missing Rate'].iloc[0], expected['a'] / len(self.df))
+
+    def test_set_co_missing(self):
+        
+        self.dataset.set_co_missing()
+        nulls = self.df.isna().astype(int)
+        expected = nulls.T @ nulls
+
+        np.testing.assert_array_equal(self.dataset.co_missing.to_numpy(), expected.to_numpy())
+        # Every missing 'a' is also missing in 'b'
+        self.assertEqual(self.dataset.co_missing.loc['a', 'b'], self.dataset.co_missing.loc['a', 'a'])
+
+    def test_co_missing_counts_blocks(self):
+        
+        rng = np.random.default_rng(1)
+        nulls = pd.DataFrame(rng.random((5003, 7)) < 0.2)
+        nulls[3] = False
+        masks = pack_null_masks(pd.DataFrame(np.where(nulls, np.nan, 1.0)))
+        expected = nulls.astype(int).T @ nulls.astype(int)
+        # Blocks and chunks that don't divide the columns and the bytes
+        np.testing.assert_array_equal(co_missing_counts(masks, block_cols=3, chunk_bytes=100), expected.to_numpy())
+
+    def test_set_nullity_heatmap(self):
+        
+        self.dataset.set_nullity_heatmap(n_bins=10)
+        nullity = self.dataset.nullity_heatmap.data
+
+        self.assertEqual(len(nullity), 3 * 10)
+        self.assertTrue(nullity['Missing Rate'].between(0, 1).all())
+        rates = nullity[nullity['Column Name'] == 'b']['Missing Rate']
+        self.assertAlmostEqual(rates.mean(), self.df['b'].isna().mean(), places=2)
+        self.assertEqual(nullity[nullity['Column Name'] == 'c']['Missing Rate'].sum(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
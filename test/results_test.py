@@ -0,0 +1,129 @@
+import unittest
+import numpy as np
+import pandas as pd
+from tab_date.logics import DateColumn
+from tab_df.logics import Dataset
+from tab_num.logics import NumericColumn
+from tab_text.logics import TextColumn
+import datetime
+import decimal
+from utils.results import DateProfile, NumericProfile, ProfileResult, TextProfile
+from utils.sampling import STATUS_ESTIMATED, STATUS_EXACT
+
+
+def profile(profiler_class, df, col_name):
+    
+    profiler = profiler_class(df=df)
+    if isinstance(profiler, NumericColumn):
+        profiler.find_num_cols()
+    elif isinstance(profiler, TextColumn):
+        profiler.find_text_cols()
+    else:
+        profiler.find_date_cols()
+    profiler.set_data(col_name)
+    return profiler
+
+
+class TestProfileResult(unittest.TestCase):
+    def setUp(self):
+        
+        rng = np.random.default_rng(0)
+        amount = rng.normal(size=1_000)
+        amount[::50] = np.nan
+        self.df = pd.DataFrame({
+            'amount': amount,
+            'name': rng.choice(['a', 'bb', 'CCC', ''], 1_000),
+            'day': rng.choice(['2022-01-01', '2022-01-02', '2022-01-08'], 1_000),
+        })
+
+    def test_slots(self):
+        
+        result = NumericProfile(n_rows=1)
+        self.assertFalse(hasattr(result, '__dict__'))
+        with self.assertRaises(TypeError):
+            NumericProfile(unknown=1)
+
+    def test_serialization_round_trip(self):
+        
+        for profiler_class, col_name in ((NumericColumn, 'amount'), (TextColumn, 'name'), (DateColumn, 'day')):
+            result = profile(profiler_class, self.df, col_name).result
+            self.assertEqual(ProfileResult.from_bytes(result.to_bytes()), result)
+            restored = ProfileResult.from_json(result.to_json())
+            self.assertIs(type(restored), type(result))
+            self.assertEqual(restored, result)
+            for field in result.__slots__:
+                self.assertIs(type(getattr(restored, field)), type(getattr(result, field)), field)
+
+    def test_json_keeps_types(self):
+        
+        result = DateProfile(
+            col_min=pd.Timestamp('2022-01-01 10:30', tz='UTC'),
+            col_max=datetime.date(2022, 1, 8),
+            n_rows=np.int64(3),
+            n_unique=decimal.Decimal('1.50'),
+            frequent=((pd.Timestamp('2022-01-01'), 2), (pd.NaT, 1)),
+            status=STATUS_EXACT,
+        )
+        restored = ProfileResult.from_json(result.to_json())
+        self.assertEqual(restored.col_min, result.col_min)
+        self.assertIsInstance(restored.col_min, pd.Timestamp)
+        self.assertIs(type(restored.col_max), datetime.date)
+        self.assertIs(type(restored.n_rows), np.int64)
+        self.assertEqual(restored.n_unique, decimal.Decimal('1.50'))
+        self.assertIsInstance(restored.frequent[0], tuple)
+        self.assertIs(restored.frequent[1][0], pd.NaT)
+
+    def test_numeric_merge_matches_whole(self):
+        
+        whole = profile(NumericColumn, self.df, 'amount').result
+        merged = profile(NumericColumn, self.df.iloc[:300], 'amount').result.merge(
+            profile(NumericColumn, self.df.iloc[300:], 'amount').result)
+
+        self.assertEqual(merged.n_rows, whole.n_rows)
+        self.assertEqual(merged.n_missing, whole.n_missing)
+        self.assertAlmostEqual(merged.col_mean, whole.col_mean)
+        self.assertAlmostEqual(merged.col_std, whole.col_std)
+        self.assertEqual(merged.col_min, whole.col_min)
+        self.assertIsNone(merged.col_median)
+
+    def test_merge_keeps_the_weaker_status(self):
+        
+        exact = profile(NumericColumn, self.df, 'amount').result
+        estimated = profile(NumericColumn, self.df.iloc[:300], 'amount').result
+        estimated.status = STATUS_ESTIMATED
+        self.assertEqual(exact.merge(estimated).status, STATUS_ESTIMATED)
+        self.assertEqual(estimated.merge(exact).status, STATUS_ESTIMATED)
+        self.assertEqual(exact.merge(exact).status, STATUS_EXACT)
+
+    def test_text_merge_matches_whole(self):
+        
+        whole = profile(TextColumn, self.df, 'name').result
+        merged = profile(TextColumn, self.df.iloc[:400], 'name').result.merge(
+            profile(TextColumn, self.df.iloc[400:], 'name').result)
+
+        self.assertEqual(merged.n_empty, whole.n_empty)
+        self.assertEqual(merged.n_upper, whole.n_upper)
+        self.assertAlmostEqual(merged.len_mean, whole.len_mean)
+        self.assertEqual(merged.frequent, whole.frequent)
+        self.assertEqual(merged.n_mode, whole.n_mode)
+
+    def test_to_frame(self):
+        
+        text_column = profile(TextColumn, self.df, 'name')
+        summary = text_column.get_summary()
+        self.assertEqual(summary.columns.tolist(), ['Description', 'Value', 'Status'])
+        self.assertEqual(summary['Value'].iloc[2], str(text_column.n_empty))
+        self.assertEqual(TextProfile().to_frame()['Value'].iloc[0], 'N/A')
+
+    def test_dataset_profile(self):
+        
+        dataset = Dataset(None)
+        dataset.df = self.df
+        dataset.set_data()
+        self.assertEqual(dataset.result.n_rows, 1_000)
+        self.assertEqual(dataset.result.get_frame('columns')['Column Name'].tolist(), ['amount', 'name', 'day'])
+        self.assertEqual(dataset.get_summary()['Value'].iloc[0], '1000')
+
+
+if __name__ == '__main__':
+    unittest.main()
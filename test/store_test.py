@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from tab_num.logics import NumericColumn
+from tab_text.logics import TextColumn
+from utils import store
+from utils.cache import clear_cache
+from utils.store import ResultStore
+
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ResultStore(os.path.join(self.temp_dir, 'results.sqlite'), max_bytes=10_000)
+        store.set_store(self.store)
+        self.csv_path = os.path.join(self.temp_dir, 'data.csv')
+        pd.DataFrame({'amount': [1, 2, 2, -4], 'name': ['a', 'b', 'b', None]}).to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        
+        store.set_store(None)
+        clear_cache()
+        shutil.rmtree(self.temp_dir)
+
+    def test_get_put(self):
+        
+        key = ResultStore.make_key('digest', 'col', 'NumericColumn', 1)
+        self.assertIsNone(self.store.get(key))
+        self.store.put(key, {'n_unique': 3})
+        self.assertEqual(self.store.get(key), {'n_unique': 3})
+
+    def test_version_changes_key(self):
+        
+        self.assertNotEqual(
+            ResultStore.make_key('digest', 'col', 'NumericColumn', 1),
+            ResultStore.make_key('digest', 'col', 'NumericColumn', 2),
+        )
+
+    def test_eviction_keeps_store_bounded(self):
+        
+        for i in range(20):
+            self.store.put(f'key_{i}', 'x' * 1_000)
+        self.assertLessEqual(self.store.size(), 10_000)
+        self.assertIsNone(self.store.get('key_0'))
+        self.assertEqual(self.store.get('key_19'), 'x' * 1_000)
+
+    def test_profiles_are_reused(self):
+        
+        numeric_col = NumericColumn(file_path=self.csv_path)
+        numeric_col.find_num_cols()
+        numeric_col.set_data('amount')
+
+        cached_col = NumericColumn(file_path=self.csv_path)
+        cached_col.find_num_cols()
+        cached_col.set_unique = None
+        cached_col.set_data('amount')
+        self.assertEqual(cached_col.n_unique, 3)
+        self.assertEqual(cached_col.n_negatives, 1)
+        pd.testing.assert_frame_equal(cached_col.frequent, numeric_col.frequent)
+
+        text_column = TextColumn(file_path=self.csv_path)
+        text_column.find_text_cols()
+        text_column.set_data('name')
+        cached_text = TextColumn(file_path=self.csv_path)
+        cached_text.find_text_cols()
+        cached_text.convert_serie_to_text = None
+        cached_text.set_data('name')
+        self.assertEqual(cached_text.n_missing, 1)
+        self.assertEqual(cached_text.n_mode, 'b')
+
+    def test_sheets_have_their_own_profiles(self):
+        
+        xlsx_path = os.path.join(self.temp_dir, 'workbook.xlsx')
+        with pd.ExcelWriter(xlsx_path) as writer:
+            pd.DataFrame({'amount': [0, 5, 10]}).to_excel(writer, sheet_name='a', index=False)
+            pd.DataFrame({'amount': [-901, 3]}).to_excel(writer, sheet_name='b', index=False)
+
+        for sheet_name, expected_min, expected_negatives in (('a', 0, 0), ('b', -901, 1)):
+            numeric_col = NumericColumn(file_path=xlsx_path, sheet_name=sheet_name)
+            numeric_col.find_num_cols()
+            numeric_col.set_data('amount')
+            self.assertEqual(numeric_col.col_min, expected_min)
+            self.assertEqual(numeric_col.n_negatives, expected_negatives)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+import pandas as pd
+from tab_text import logics
+from tab_text.logics import TextColumn
+
+
+class TestTextColumn(unittest.TestCase):
+    def setUp(self):
+        
+        self.df = pd.DataFrame({
+            'text': ['abc', 'ABC', '123', ' ', '', np.nan, None, 'Mixed 1', 'abc'],
+            'number': range(9),
+        })
+
+    def check_summary(self, text_column):
+        
+        self.assertEqual(text_column.cols_list, ['text'])
+        self.assertEqual(text_column.n_missing, 2)
+        self.assertEqual(text_column.n_empty, 1)
+        self.assertEqual(text_column.n_space, 1)
+        self.assertEqual(text_column.n_lower, 2)
+        self.assertEqual(text_column.n_upper, 1)
+        self.assertEqual(text_column.n_alpha, 3)
+        self.assertEqual(text_column.n_digit, 1)
+        self.assertEqual(text_column.n_mode, 'abc')
+        self.assertEqual(text_column.len_min, 0)
+        self.assertEqual(text_column.len_max, 7)
+        self.assertEqual(text_column.lengths['count'].sum(), 7)
+
+    def test_set_data(self):
+        
+        text_column = TextColumn(df=self.df)
+        text_column.find_text_cols()
+        text_column.set_data('text')
+        self.check_summary(text_column)
+        self.assertEqual(text_column.frequent.iloc[0]['value'], 'abc')
+
+    def test_set_data_without_pyarrow(self):
+        
+        has_pyarrow = logics.HAS_PYARROW
+        logics.HAS_PYARROW = False
+        try:
+            text_column = TextColumn(df=self.df)
+            text_column.find_text_cols()
+            text_column.set_data('text')
+            self.check_summary(text_column)
+        finally:
+            logics.HAS_PYARROW = has_pyarrow
+
+
+if __name__ == '__main__':
+    unittest.main()
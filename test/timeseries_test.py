@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from tab_ts.logics import TimeSerie, choose_interval, lttb, minmax_downsample
+from utils.cache import clear_cache
+
+
+class TestTimeSerie(unittest.TestCase):
+    def setUp(self):
+        
+        rng = np.random.default_rng(0)
+        n_rows = 50_000
+        self.df = pd.DataFrame({
+            'date': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 3 * 365 * 86400, n_rows), unit='s'),
+            'value': rng.normal(size=n_rows),
+            'label': ['a'] * n_rows,
+        })
+        self.df.loc[10, 'value'] = 100.0
+        self.time_serie = TimeSerie(df=self.df)
+        self.time_serie.find_cols()
+
+    def test_find_cols(self):
+        
+        self.assertEqual(self.time_serie.date_cols_list, ['date'])
+        self.assertEqual(self.time_serie.num_cols_list, ['value'])
+
+    def test_choose_interval(self):
+        
+        start = pd.Timestamp('2020-01-01')
+        self.assertEqual(choose_interval(start, start + pd.Timedelta(hours=10), 1000)[0], '1min')
+        self.assertEqual(choose_interval(start, start + pd.Timedelta(days=3 * 365), 1000)[0], '1W')
+        self.assertEqual(choose_interval(start, start + pd.Timedelta(days=3 * 365), 100)[0], '1M')
+
+    def test_set_data_fits_width(self):
+        
+        self.time_serie.set_data('date', 'value', width=300)
+        resampled = self.time_serie.resampled
+        points = self.time_serie.points
+
+        self.assertEqual(self.time_serie.interval, '1D')
+        self.assertEqual(resampled['count'].sum(), len(self.df))
+        self.assertLessEqual(len(points), 300)
+        self.assertTrue((points['min'] <= points['mean']).all())
+        self.assertTrue((points['mean'] <= points['max']).all())
+        # The outlier survives downsampling in the band
+        self.assertEqual(points['max'].max(), 100.0)
+        self.assertAlmostEqual(points['min'].min(), self.df['value'].min())
+
+    def test_set_data_calendar_interval(self):
+        
+        self.time_serie.set_data('date', 'value', width=10, method='minmax')
+
+        self.assertEqual(self.time_serie.interval, '1M')
+        self.assertEqual(len(self.time_serie.resampled), 36)
+        self.assertLessEqual(len(self.time_serie.points), 10)
+        self.assertEqual(self.time_serie.points['max'].max(), 100.0)
+
+    def test_sheets_have_their_own_series(self):
+        
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.addCleanup(clear_cache)
+        xlsx_path = os.path.join(temp_dir, 'workbook.xlsx')
+        dates = pd.date_range('2020-01-01', periods=4, freq='D')
+        with pd.ExcelWriter(xlsx_path) as writer:
+            pd.DataFrame({'date': dates, 'value': [1.0, 2.0, 3.0, 4.0]}).to_excel(writer, sheet_name='a', index=False)
+            pd.DataFrame({'date': dates, 'value': [-5.0, 0.0, 5.0, 9.0]}).to_excel(writer, sheet_name='b', index=False)
+
+        for sheet_name, expected_max in (('a', 4.0), ('b', 9.0)):
+            time_serie = TimeSerie(file_path=xlsx_path, sheet_name=sheet_name)
+            time_serie.find_cols()
+            time_serie.set_data('date', 'value')
+            self.assertEqual(time_serie.points['max'].max(), expected_max)
+
+    def test_set_data_invalid_columns(self):
+        
+        with self.assertRaises(ValueError):
+            self.time_serie.set_data('value', 'date')
+
+    def test_lttb_keeps_edges_and_peaks(self):
+        
+        x = np.arange(1000, dtype=np.float64)
+        y = np.zeros(1000)
+        y[500] = 10.0
+        selected = lttb(x, y, 50)
+
+        self.assertEqual(len(selected), 50)
+        self.assertEqual(selected[0], 0)
+        self.assertEqual(selected[-1], 999)
+        self.assertIn(500, selected)
+        self.assertTrue((np.diff(selected) > 0).all())
+
+    def test_minmax_downsample(self):
+        
+        y = np.sin(np.linspace(0, 20, 1000))
+        selected = minmax_downsample(y, 100)
+
+        self.assertLessEqual(len(selected), 100)
+        self.assertIn(int(np.argmax(y)), selected)
+        self.assertIn(int(np.argmin(y)), selected)
+
+
+if __name__ == '__main__':
+    unittest.main()
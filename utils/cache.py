@@ -0,0 +1,100 @@
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+MAX_CACHED_RESULTS = 128
+# Parsed frames dominate, so the cache is bounded by their size too
+MAX_CACHED_BYTES = int(os.environ.get('CSV_EXPLORER_CACHE_BYTES', 1 << 30))
+MAX_CACHED_HASHES = 1024
+
+_hashes = OrderedDict()
+_results = OrderedDict()
+_sizes = {}
+_lock = threading.Lock()
+
+
+def file_hash(file_path, chunk_size=1 << 20):
+    
+    # Hashing reads the whole file, so remember the digest for as long as the
+    # file on disk is unchanged
+    stat = os.stat(file_path)
+    stamp = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        digest = _hashes.get(stamp)
+        if digest is not None:
+            _hashes.move_to_end(stamp)
+            return digest
+
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            hasher.update(chunk)
+    digest = hasher.hexdigest()
+
+    with _lock:
+        _hashes[stamp] = digest
+        # Every rewrite of a file adds a stamp, the least recently used go
+        while len(_hashes) > MAX_CACHED_HASHES:
+            _hashes.popitem(last=False)
+    return digest
+
+
+def get_cached(key):
+    
+    with _lock:
+        if key not in _results:
+            return None
+        _results.move_to_end(key)
+        return _results[key]
+
+
+def value_size(value):
+    
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(index=True, deep=True)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(value_size(item) for item in value)
+    data = getattr(value, 'data', None)
+    if isinstance(data, pd.DataFrame):
+        # Altair charts hold their data frame
+        return value_size(data)
+    return sys.getsizeof(value)
+
+
+def set_cached(key, value, max_bytes=None):
+    
+    max_bytes = MAX_CACHED_BYTES if max_bytes is None else max_bytes
+    size = value_size(value)
+    with _lock:
+        if key in _results:
+            del _results[key]
+            _sizes.pop(key)
+        # A value bigger than the whole budget is simply not kept
+        if size > max_bytes:
+            return
+        _results[key] = value
+        _sizes[key] = size
+        total = sum(_sizes.values())
+        while len(_results) > MAX_CACHED_RESULTS or total > max_bytes:
+            oldest, _ = _results.popitem(last=False)
+            total -= _sizes.pop(oldest)
+
+
+def cached_bytes():
+    
+    with _lock:
+        return sum(_sizes.values())
+
+
+def clear_cache():
+    
+    with _lock:
+        _hashes.clear()
+        _results.clear()
+        _sizes.clear()
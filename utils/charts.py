@@ -0,0 +1,87 @@
+import os
+from functools import lru_cache
+
+import altair as alt
+import pandas as pd
+
+
+CHART_TOP_N = 20
+# Largest chart spec sent to the browser, in bytes
+CHART_SPEC_BYTES = int(os.environ.get('CSV_EXPLORER_CHART_SPEC_BYTES', 100_000))
+MAX_LABEL_CHARS = 40
+OTHER_LABEL = 'other'
+CHART_CACHE_SIZE = 256
+
+
+def unique_labels(values):
+    
+    # Truncated values can collide, later ones get a number appended
+    labels = []
+    for value in values:
+        label = str(value)
+        if len(label) > MAX_LABEL_CHARS:
+            label = label[:MAX_LABEL_CHARS - 1] + '…'
+        base, n = label, 2
+        while label in labels:
+            label = f"{base} ({n})"
+            n += 1
+        labels.append(label)
+    return labels
+
+
+def top_n_counts(frequent, n_values, top_n=CHART_TOP_N):
+    
+    # frequent holds the most frequent values by decreasing occurrence, all
+    # the values after the top_n first ones are summed into a single bar
+    top = frequent.head(top_n)
+    labels = unique_labels(top['value'])
+    counts = pd.DataFrame({'value': labels, 'count': top['occurrence'].to_numpy()})
+
+    other = int(n_values - counts['count'].sum())
+    if other > 0:
+        # A real value named like the rollup keeps its name
+        other_label = OTHER_LABEL
+        while other_label in labels:
+            other_label = f"({other_label})"
+        counts = pd.concat([counts, pd.DataFrame({'value': [other_label], 'count': [other]})], ignore_index=True)
+    return counts
+
+
+def spec_size(chart):
+    
+    return len(chart.to_json(validate=False, indent=None).encode())
+
+
+def make_barchart(counts, title=None):
+    
+    chart = alt.Chart(counts).mark_bar().encode(
+        alt.X('value:N', title='value', sort=None),
+        alt.Y('count:Q', title='Count'),
+        tooltip=['value', 'count']
+    )
+    if title is not None:
+        chart = chart.properties(title=title)
+    return chart
+
+
+def categorical_barchart(frequent, n_values, title=None, top_n=CHART_TOP_N, max_bytes=CHART_SPEC_BYTES):
+    
+    # Only the number of bars fitting the budget is cached, keyed on the top
+    # values and the total so it stays right for any file, sheet or sample.
+    # Every call gets its own chart that the caller is free to change
+    top = frequent.head(top_n)
+    top_n = fit_top_n(tuple(top['value'].astype(str)), tuple(top['occurrence'].astype(int).tolist()),
+                      int(n_values), title, top_n, max_bytes)
+    return make_barchart(top_n_counts(top, n_values, top_n), title)
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def fit_top_n(values, occurrences, n_values, title, top_n, max_bytes):
+    
+    frequent = pd.DataFrame({'value': list(values), 'occurrence': list(occurrences)})
+    # Fewer bars until the spec fits the budget, down to the "other" bar alone
+    while top_n > 0:
+        if spec_size(make_barchart(top_n_counts(frequent, n_values, top_n), title)) <= max_bytes:
+            return top_n
+        top_n //= 2
+    return 0
@@ -0,0 +1,82 @@
+import pandas as pd
+
+from utils.sampling import sample_serie
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+DETECT_SAMPLE_SIZE = 1_000
+# Every sampled value must look like a number, a column holding real text
+# such as "see note" is left alone rather than losing those values
+DETECT_THRESHOLD = 1.0
+
+# Optional sign, currency symbol, digits with or without thousands
+# separators, decimals and a trailing percent sign, the whole number may sit
+# in accounting parentheses, both of them or none
+NUMBER_PATTERN = r'[-+]?\s*[$€£¥]?\s*[-+]?(?:\d{1,3}(?:,\d{3})+|\d*)(?:\.\d+)?\s*%?'
+NUMERIC_TEXT_PATTERN = rf'(?=.*\d)(?:\({NUMBER_PATTERN}\)|{NUMBER_PATTERN})'
+CLEANUP_PATTERN = r'[\s$€£¥,%()]'
+EDGE_CHARACTERS = ' \t$€£¥%()'
+
+
+def looks_numeric(serie, sample_size=DETECT_SAMPLE_SIZE, threshold=DETECT_THRESHOLD):
+    
+    sample = sample_serie(serie, sample_size).dropna()
+    if sample.empty:
+        return False
+    sample = sample.astype(str).str.strip()
+    return sample.str.fullmatch(NUMERIC_TEXT_PATTERN).mean() >= threshold
+
+
+def find_numeric_text_cols(df, sample_size=DETECT_SAMPLE_SIZE, threshold=DETECT_THRESHOLD):
+    
+    return [
+        col for col in df.select_dtypes(include=['object']).columns
+        if looks_numeric(df[col], sample_size, threshold)
+    ]
+
+
+def parse_numbers(text):
+    
+    # Symbols normally sit at the ends of the value, so trimming them and
+    # dropping thousands separators lets Arrow cast the whole column at once.
+    # Anything unusual falls back to the regex cleanup.
+    if HAS_PYARROW:
+        trimmed = pc.replace_substring(pc.utf8_trim(pa.array(text.array), EDGE_CHARACTERS), ',', '')
+        try:
+            return pd.Series(pc.cast(trimmed, pa.float64()).to_numpy(zero_copy_only=False), index=text.index)
+        except pa.ArrowInvalid:
+            pass
+    numbers = pd.to_numeric(text.str.replace(CLEANUP_PATTERN, '', regex=True), errors='coerce')
+    return numbers.astype('float64')
+
+
+def clean_numeric_text(serie):
+    
+    # "12%" stays 12, the number as written, and "(5.00)" becomes -5
+    text = serie.astype('string[pyarrow]' if HAS_PYARROW else 'string').str.strip()
+    opened = text.str.startswith('(').fillna(False).to_numpy(dtype=bool)
+    closed = text.str.endswith(')').fillna(False).to_numpy(dtype=bool)
+    numbers = parse_numbers(text)
+    # A lone parenthesis is not a number
+    numbers = numbers.where(opened == closed)
+    return numbers.where(~(opened & closed), -numbers)
+
+
+def coerce_numeric_text(df, sample_size=DETECT_SAMPLE_SIZE, threshold=DETECT_THRESHOLD):
+    
+    converted = {}
+    for col in find_numeric_text_cols(df, sample_size, threshold):
+        numbers = clean_numeric_text(df[col])
+        # The sample can miss a few text values, the column is only converted
+        # when no value of the whole column would turn into a missing one
+        if numbers.isna().sum() == df[col].isna().sum():
+            converted[col] = numbers
+    if not converted:
+        return df
+    return df.assign(**converted)
@@ -0,0 +1,123 @@
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+MANIFEST_NAME = 'manifest.json'
+# Frames built on a store remember it, so a cached frame that lost its
+# memory-mapped columns can be rebuilt
+STORE_ATTR = 'numeric_store'
+
+
+def numeric_store_dir(cache_path):
+    
+    return os.path.splitext(cache_path)[0] + '-numeric'
+
+
+def is_storable(serie):
+    
+    return isinstance(serie.dtype, np.dtype) and serie.dtype.kind in 'biuf'
+
+
+def write_numeric_store(df, store_dir):
+    
+    if os.path.isdir(store_dir):
+        return
+    columns = [col for col in df.columns if isinstance(col, str) and is_storable(df[col])]
+    if not columns:
+        return
+
+    # Build the store in a private directory and rename it into place, so
+    # concurrent processes and sessions never see a half written store
+    temp_dir = f"{store_dir}.{os.getpid()}-{threading.get_ident()}.tmp"
+    os.makedirs(temp_dir, exist_ok=True)
+    try:
+        # The column order lets the frame be rebuilt from the store and the
+        # other columns only, without reading the numeric ones again
+        manifest = {'n_rows': len(df), 'columns': {}, 'order': list(df.columns)}
+        for i, col in enumerate(columns):
+            file_name = f"{i}.npy"
+            np.save(os.path.join(temp_dir, file_name), np.ascontiguousarray(df[col].to_numpy()))
+            manifest['columns'][col] = file_name
+        with open(os.path.join(temp_dir, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f)
+        os.rename(temp_dir, store_dir)
+    except OSError:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def read_manifest(store_dir):
+    
+    manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        return json.load(f)
+
+
+def map_columns(store_dir, manifest):
+    
+    # mmap_mode='r' maps the file read-only, so every session and process
+    # opening the store shares the same pages from the OS page cache
+    return {
+        col: np.load(os.path.join(store_dir, file_name), mmap_mode='r')
+        for col, file_name in manifest['columns'].items()
+    }
+
+
+def read_numeric_store(store_dir, n_rows):
+    
+    manifest = read_manifest(store_dir)
+    if manifest is None or manifest.get('n_rows') != n_rows:
+        return {}
+    return map_columns(store_dir, manifest)
+
+
+def build_frame(arrays, others, columns, store_dir):
+    
+    data = {col: arrays[col] if col in arrays else others[col] for col in columns}
+    df = pd.DataFrame(data, index=others.index, copy=False)
+    df.attrs[STORE_ATTR] = store_dir
+    return df
+
+
+def read_stored_frame(store_dir, read_columns):
+    
+    # read_columns(names) returns the non numeric columns of the frame, the
+    # numeric ones are mapped straight from the store and never read
+    manifest = read_manifest(store_dir)
+    if manifest is None or 'order' not in manifest:
+        return None
+    arrays = map_columns(store_dir, manifest)
+    others = read_columns([col for col in manifest['order'] if col not in arrays])
+    if len(others) != manifest['n_rows']:
+        return None
+    return build_frame(arrays, others, manifest['order'], store_dir)
+
+
+def is_memory_mapped(df):
+    
+    # Consolidating the blocks or an in-place write replaces the mapped
+    # arrays with private copies of the data
+    store_dir = df.attrs.get(STORE_ATTR)
+    if store_dir is None:
+        return True
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        return False
+    return all(isinstance(df[col].values, np.memmap) for col in manifest['columns'])
+
+
+def attach_numeric_store(df, store_dir):
+    
+    if df.columns.has_duplicates:
+        return df
+    write_numeric_store(df, store_dir)
+    arrays = read_numeric_store(store_dir, len(df))
+    if not arrays:
+        return df
+    return build_frame(arrays, df, df.columns, store_dir)
@@ -0,0 +1,120 @@
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+
+try:
+    import zstandard
+    HAS_ZSTANDARD = True
+except ImportError:
+    HAS_ZSTANDARD = False
+
+
+# Compressed files are recognised by their first bytes, not their name.
+# bz2 is followed by its block size from 1 to 9, a text file starting with
+# "BZh" is not taken for one
+MAGIC_BYTES = (
+    (b'\x1f\x8b', 'gzip'),
+    *((b'BZh' + str(level).encode(), 'bz2') for level in range(1, 10)),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+)
+BLOCK_SIZE = 1 << 22
+MAX_BLOCKS = 4
+
+
+def detect_compression(file_path):
+    
+    with open(file_path, 'rb') as f:
+        head = f.read(max(len(magic) for magic, _ in MAGIC_BYTES))
+    for magic, compression in MAGIC_BYTES:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_decompressed(file_path, compression):
+    
+    if compression == 'gzip':
+        return gzip.open(file_path, 'rb')
+    if compression == 'bz2':
+        return bz2.open(file_path, 'rb')
+    if compression == 'xz':
+        return lzma.open(file_path, 'rb')
+    if compression == 'zstd':
+        if not HAS_ZSTANDARD:
+            raise ImportError("Reading zstd compressed files requires the zstandard package.")
+        # Files from zstd -T0 or concatenated ones hold several frames
+        return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), read_across_frames=True, closefd=True)
+    raise ValueError(f"Unknown compression '{compression}'.")
+
+
+# Decompression runs on its own thread, at most max_blocks ahead of the
+# parser reading from it
+class ThreadedReader(io.RawIOBase):
+    def __init__(self, source, block_size=BLOCK_SIZE, max_blocks=MAX_BLOCKS):
+        self.source = source
+        self.block_size = block_size
+        self.blocks = queue.Queue(maxsize=max_blocks)
+        self.stopped = threading.Event()
+        self.current = memoryview(b'')
+        self.finished = False
+        self.thread = threading.Thread(target=self.fill, daemon=True)
+        self.thread.start()
+
+    def fill(self):
+        
+        try:
+            while not self.stopped.is_set():
+                block = self.source.read(self.block_size)
+                self.put(block)
+                if not block:
+                    return
+        except Exception as e:
+            self.put(e)
+
+    def put(self, item):
+        
+        # Wakes up regularly so an abandoned reader doesn't leave the
+        # thread blocked on a full queue
+        while not self.stopped.is_set():
+            try:
+                self.blocks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def readable(self):
+        
+        return True
+
+    def readinto(self, buffer):
+        
+        while not self.current and not self.finished:
+            block = self.blocks.get()
+            if isinstance(block, Exception):
+                self.finished = True
+                raise block
+            if not block:
+                self.finished = True
+            self.current = memoryview(block)
+        n = min(len(buffer), len(self.current))
+        buffer[:n] = self.current[:n]
+        self.current = self.current[n:]
+        return n
+
+    def close(self):
+        
+        if not self.closed:
+            self.stopped.set()
+            self.thread.join()
+            self.source.close()
+        super().close()
+
+
+def open_stream(file_path, compression, block_size=BLOCK_SIZE, max_blocks=MAX_BLOCKS):
+    
+    reader = ThreadedReader(open_decompressed(file_path, compression), block_size, max_blocks)
+    return io.BufferedReader(reader, buffer_size=block_size)
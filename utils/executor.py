@@ -0,0 +1,178 @@
+import copy
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from utils.cache import file_hash
+
+
+MAX_WORKERS = 4
+POLL_SECONDS = 0.2
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    def __init__(self):
+        self.event = threading.Event()
+
+    def cancel(self):
+        self.event.set()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+
+def check_cancelled(token):
+    
+    if token is not None and token.cancelled:
+        raise JobCancelled()
+
+
+class Job:
+    def __init__(self, job_key, future, token):
+        self.job_key = job_key
+        self.future = future
+        self.token = token
+        self.refs = 0
+
+
+class ProfileExecutor:
+    def __init__(self, max_workers=MAX_WORKERS):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='profile')
+        # Cancelling a future runs its done callback right away, which takes
+        # the lock again
+        self.lock = threading.RLock()
+        self.jobs = {}
+        self.slots = {}
+
+    def submit(self, slot, job_key, fn):
+        
+        # A slot is one widget in one session, it only ever waits on its
+        # latest job. Jobs are shared by key, so identical requests from any
+        # slot are merged, and a job no slot points to any more is cancelled.
+        # Slots hold the job itself, a finished job's key may already belong
+        # to a newer job.
+        with self.lock:
+            job = self.jobs.get(job_key)
+            previous = self.slots.get(slot)
+            if job is not None and previous is job:
+                return job.future
+
+            if job is None:
+                token = CancelToken()
+                job = Job(job_key, None, token)
+                job.future = self.pool.submit(fn, token)
+                self.jobs[job_key] = job
+                job.future.add_done_callback(lambda done, job=job: self.forget(job))
+            job.refs += 1
+
+            self.slots[slot] = job
+            if previous is not None:
+                self.release(previous)
+            return job.future
+
+    def release(self, job):
+        
+        job.refs -= 1
+        if job.refs <= 0 and self.jobs.get(job.job_key) is job:
+            job.token.cancel()
+            # A running job only stops at its next check, nothing must
+            # point to it meanwhile
+            self.forget(job)
+            job.future.cancel()
+
+    def forget(self, job):
+        
+        with self.lock:
+            if self.jobs.get(job.job_key) is job:
+                del self.jobs[job.job_key]
+            for slot in [slot for slot, slot_job in self.slots.items() if slot_job is job]:
+                del self.slots[slot]
+
+    def shutdown(self):
+        
+        with self.lock:
+            for job in self.jobs.values():
+                job.token.cancel()
+            self.jobs.clear()
+            self.slots.clear()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def get_executor():
+    
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProfileExecutor()
+        return _executor
+
+
+def file_key(file_path=None, df=None, sheet_name=None):
+    
+    # Every sheet of a workbook shares the file hash. A frame without a file
+    # gets a key of its own, id(df) is reused once the frame is collected
+    # and could attach a new frame to the job of an old one
+    if file_path is not None and os.path.exists(file_path):
+        return (file_hash(file_path), sheet_name)
+    return object()
+
+
+def submit_profile(slot, job_key, profiler, col_name):
+    
+    def job(token):
+        profiler.cancel_token = token
+        try:
+            profiler.set_data(col_name)
+        finally:
+            # A cancelled profiler is reused by the page, it must not keep
+            # the token that stopped it
+            profiler.cancel_token = None
+        return profiler
+
+    return get_executor().submit(slot, job_key, job)
+
+
+def wait_profile(future, col_name, placeholder=None):
+    
+    # Touching the placeholder while waiting hands control back to Streamlit,
+    # which stops this run as soon as the user changes the selection
+    # A job is only cancelled once no session waits on it, which leaves a
+    # run that is about to be replaced, it returns None
+    start = time.perf_counter()
+    while True:
+        try:
+            result = future.result(timeout=POLL_SECONDS)
+            break
+        except FutureTimeoutError:
+            if placeholder is not None:
+                placeholder.caption(f"Profiling '{col_name}'... {time.perf_counter() - start:.1f}s")
+        except (CancelledError, JobCancelled):
+            if placeholder is not None:
+                placeholder.caption(f"Profiling '{col_name}' was cancelled.")
+            return None
+        except Exception as e:
+            # The page reports the failure like the tabs report parsing errors
+            if placeholder is None:
+                raise
+            placeholder.error(f"Unable to profile '{col_name}': {e}")
+            return None
+    if placeholder is not None:
+        placeholder.empty()
+    
+    # A merged job hands the same profiler to several sessions, each one gets
+    # its own shallow copy to set further attributes on
+    return copy.copy(result)
+
+
+def run_profile(slot, job_key, profiler, col_name, placeholder=None):
+    
+    return wait_profile(submit_profile(slot, job_key, profiler, col_name), col_name, placeholder)
@@ -0,0 +1,310 @@
+import os
+import shutil
+import tempfile
+import threading
+
+import pandas as pd
+
+from utils.cache import file_hash, get_cached, set_cached
+from utils.coerce import coerce_numeric_text
+from utils.colstore import (
+    STORE_ATTR, attach_numeric_store, is_memory_mapped, numeric_store_dir, read_stored_frame
+)
+from utils.decompress import detect_compression, open_stream
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import python_calamine  # noqa: F401
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+# pandas only has the calamine engine from 2.2 on
+CALAMINE_ENGINE = HAS_CALAMINE and tuple(int(part) for part in pd.__version__.split('.')[:2]) >= (2, 2)
+
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+CACHE_DIR_NAME = '.cache'
+# Bump when parsing changes so stale columnar caches are not picked up
+LOADER_VERSION = 3
+EXCEL_CHUNK_ROWS = 50_000
+# Parquet caches and numeric stores kept on disk, least recently used
+# files go first
+MAX_DISK_CACHE_BYTES = int(os.environ.get('CSV_EXPLORER_DISK_CACHE_BYTES', 4 << 30))
+
+
+def is_excel(file_path):
+    
+    return str(file_path).lower().endswith(EXCEL_EXTENSIONS)
+
+
+def list_sheets(file_path):
+    
+    if not is_excel(file_path):
+        return []
+    if HAS_CALAMINE:
+        return python_calamine.CalamineWorkbook.from_path(file_path).sheet_names
+    if file_path.lower().endswith('.xls'):
+        return pd.ExcelFile(file_path).sheet_names
+
+    from openpyxl import load_workbook
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def read_csv(file_path, **kwargs):
+    
+    compression = detect_compression(file_path)
+    try:
+        return parse_csv(file_path, compression, **kwargs)
+    except UnicodeDecodeError:
+        return parse_csv(file_path, compression, encoding="ISO-8859-1", **kwargs)
+
+
+def parse_csv(file_path, compression=None, **kwargs):
+    
+    if compression is None:
+        return pd.read_csv(file_path, **kwargs)
+    # Compressed uploads are kept as they are and decompressed as a stream
+    # while the parser reads from it, never fully on disk or in memory
+    with open_stream(file_path, compression) as stream:
+        return pd.read_csv(stream, **kwargs)
+
+
+def dedupe_columns(columns):
+    
+    # Repeated headers become name.1, name.2... like pd.read_excel does
+    seen = set()
+    counts = {}
+    deduped = []
+    for name in columns:
+        new_name = name
+        while new_name in seen:
+            counts[name] = counts.get(name, 0) + 1
+            new_name = f"{name}.{counts[name]}"
+        seen.add(new_name)
+        deduped.append(new_name)
+    return deduped
+
+
+# Chunks of a sheet are written to parquet files as they are read, so only
+# one chunk of rows is in memory at a time and the frame is built once at the
+# end without a concat copy. A chunk Arrow can't convert, like a column
+# mixing numbers and text, brings the chunks back in memory.
+class SpilledChunks:
+    def __init__(self, columns):
+        self.columns = columns
+        self.temp_dir = tempfile.mkdtemp()
+        self.paths = []
+        self.frames = None if HAS_PYARROW else []
+
+    def append(self, chunk):
+        
+        chunk = chunk.infer_objects()
+        if self.frames is None:
+            try:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                self.paths.append(os.path.join(self.temp_dir, f"{len(self.paths)}.parquet"))
+                pq.write_table(table, self.paths[-1])
+                return
+            except pa.ArrowException:
+                self.frames = self.read_spilled()
+        self.frames.append(chunk)
+
+    def read_spilled(self):
+        
+        frames = [pd.read_parquet(path) for path in self.paths]
+        for frame in frames:
+            frame.columns = self.columns
+        return frames
+
+    def to_frame(self):
+        
+        if self.frames is None:
+            try:
+                # A column can be all empty in one chunk and numbers in the
+                # next, the chunks are read with the widest of their types
+                schema = pa.unify_schemas([pq.read_schema(path) for path in self.paths], promote_options='permissive')
+                table = ds.dataset(self.paths, schema=schema, format='parquet').to_table()
+                df = table.to_pandas(self_destruct=True, split_blocks=True)
+                # Parquet only keeps text column names
+                df.columns = self.columns
+                return df
+            except pa.ArrowException:
+                self.frames = self.read_spilled()
+        return pd.concat(self.frames, ignore_index=True).infer_objects()
+
+    def close(self):
+        
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+def read_excel(file_path, sheet_name=None, chunk_rows=EXCEL_CHUNK_ROWS):
+    
+    sheet = 0 if sheet_name is None else sheet_name
+    if CALAMINE_ENGINE:
+        return pd.read_excel(file_path, sheet_name=sheet, engine='calamine')
+    if file_path.lower().endswith('.xls'):
+        return pd.read_excel(file_path, sheet_name=sheet)
+
+    # openpyxl in read-only mode streams rows from the sheet XML instead of
+    # building the whole workbook DOM, rows are turned into DataFrame chunks
+    from openpyxl import load_workbook
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[sheet] if isinstance(sheet, int) else workbook[sheet]
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        columns = dedupe_columns([f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)])
+
+        chunks = SpilledChunks(columns)
+        try:
+            buffer = []
+            n_chunks = 0
+            for row in rows:
+                buffer.append(row[:len(columns)])
+                if len(buffer) >= chunk_rows:
+                    chunks.append(pd.DataFrame(buffer, columns=columns))
+                    n_chunks += 1
+                    buffer = []
+            if buffer or not n_chunks:
+                chunks.append(pd.DataFrame(buffer, columns=columns))
+            return chunks.to_frame()
+        finally:
+            chunks.close()
+    finally:
+        workbook.close()
+
+
+def columnar_cache_path(file_path, digest, sheet_name=None):
+    
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR_NAME)
+    suffix = '' if sheet_name is None else f"-{sheet_name}"
+    return os.path.join(cache_dir, f"{digest}-v{LOADER_VERSION}{suffix}.parquet")
+
+
+def read_columnar_cache(cache_path, store_dir=None):
+    
+    if HAS_PYARROW and os.path.exists(cache_path):
+        try:
+            df = None
+            if store_dir is not None:
+                df = read_stored_frame(store_dir, lambda columns: pd.read_parquet(cache_path, columns=columns))
+            if df is None:
+                df = pd.read_parquet(cache_path)
+            # The modification time marks the entry as recently used
+            os.utime(cache_path)
+            return df
+        except Exception:
+            os.remove(cache_path)
+    return None
+
+
+def write_columnar_cache(df, cache_path):
+    
+    if not HAS_PYARROW:
+        return
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    temp_path = f"{cache_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        df.to_parquet(temp_path, index=False)
+        os.replace(temp_path, cache_path)
+    except Exception:
+        # Mixed-type or non-string column names can't go to parquet, the
+        # file will simply be parsed again next time
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def cache_entries(cache_dir):
+    
+    # A parquet cache and its numeric store make one entry, named after the
+    # parquet file
+    entries = {}
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.endswith('.parquet'):
+            entry = path
+        elif name.endswith('-numeric') and os.path.isdir(path):
+            entry = path[:-len('-numeric')] + '.parquet'
+        else:
+            continue
+        if os.path.isdir(path):
+            files = [os.path.join(root, file) for root, _, names in os.walk(path) for file in names]
+        else:
+            files = [path]
+        size, used = entries.get(entry, (0, 0))
+        for file in files:
+            try:
+                stat = os.stat(file)
+            except OSError:
+                continue
+            size += stat.st_size
+            used = max(used, stat.st_mtime)
+        entries[entry] = (size, used)
+    return entries
+
+
+def prune_cache_dir(cache_dir, max_bytes=MAX_DISK_CACHE_BYTES, keep=()):
+    
+    if not os.path.isdir(cache_dir):
+        return
+    entries = cache_entries(cache_dir)
+    total = sum(size for size, _ in entries.values())
+    for entry, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+        if total <= max_bytes:
+            break
+        if entry in keep:
+            continue
+        # Mapped files stay readable by the sessions using them until they
+        # are closed, on systems that refuse the removal they stay for later
+        try:
+            os.remove(entry)
+        except OSError:
+            pass
+        shutil.rmtree(numeric_store_dir(entry), ignore_errors=True)
+        total -= size
+
+
+def load_dataframe(file_path, sheet_name=None):
+    
+    digest = file_hash(file_path)
+    key = ('dataset', digest, sheet_name)
+    df = get_cached(key)
+    if df is not None and is_memory_mapped(df):
+        return df
+
+    cache_path = columnar_cache_path(file_path, digest, sheet_name)
+    store_dir = numeric_store_dir(cache_path)
+    if df is None:
+        df = read_columnar_cache(cache_path, store_dir)
+    if df is None:
+        if is_excel(file_path):
+            df = read_excel(file_path, sheet_name=sheet_name)
+        else:
+            df = read_csv(file_path)
+        # Numbers stored as text are converted once, before caching, so no
+        # later rerun or tab has to repeat it
+        df = coerce_numeric_text(df)
+        write_columnar_cache(df, cache_path)
+
+    # Numeric columns are swapped for memory-mapped arrays shared between
+    # sessions and worker processes, treat the returned frame as read-only
+    if STORE_ATTR not in df.attrs or not is_memory_mapped(df):
+        df = attach_numeric_store(df, store_dir)
+        prune_cache_dir(os.path.dirname(cache_path), keep=(cache_path,))
+
+    set_cached(key, df)
+    return df
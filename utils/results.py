@@ -0,0 +1,368 @@
+import base64
+import datetime
+import decimal
+import json
+import math
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from utils.sampling import STATUS_ESTIMATED, format_estimate
+
+
+def to_jsonable(value):
+    
+    # Types JSON doesn't have are tagged so from_json gives back the same
+    # values, a stored result is then equal to a freshly computed one
+    if value is None or isinstance(value, (bool, int, float, str)) and not isinstance(value, np.generic):
+        return value
+    if value is pd.NaT:
+        return {'__nat__': True}
+    if isinstance(value, np.generic):
+        return {'__numpy__': value.dtype.str, 'value': to_jsonable(value.item())}
+    if isinstance(value, pd.Timestamp):
+        return {'__timestamp__': value.isoformat()}
+    if isinstance(value, pd.Timedelta):
+        return {'__timedelta__': value.value}
+    if isinstance(value, datetime.datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, decimal.Decimal):
+        return {'__decimal__': str(value)}
+    if isinstance(value, tuple):
+        return {'__tuple__': [to_jsonable(item) for item in value]}
+    if isinstance(value, list):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {'__dict__': [[to_jsonable(key), to_jsonable(item)] for key, item in value.items()]}
+    # Anything else still comes back as it was
+    return {'__pickle__': base64.b64encode(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)).decode()}
+
+
+def from_jsonable(raw):
+    
+    if '__nat__' in raw:
+        return pd.NaT
+    if '__numpy__' in raw:
+        return np.array(raw['value'], dtype=np.dtype(raw['__numpy__']))[()]
+    if '__timestamp__' in raw:
+        return pd.Timestamp(raw['__timestamp__'])
+    if '__timedelta__' in raw:
+        return pd.Timedelta(raw['__timedelta__'])
+    if '__datetime__' in raw:
+        return datetime.datetime.fromisoformat(raw['__datetime__'])
+    if '__date__' in raw:
+        return datetime.date.fromisoformat(raw['__date__'])
+    if '__decimal__' in raw:
+        return decimal.Decimal(raw['__decimal__'])
+    if '__tuple__' in raw:
+        return tuple(raw['__tuple__'])
+    if '__dict__' in raw:
+        return {key: item for key, item in raw['__dict__']}
+    if '__pickle__' in raw:
+        return pickle.loads(base64.b64decode(raw['__pickle__']))
+    return raw
+
+
+def merge_status(left, right):
+    
+    # A merge is only exact when both sides are
+    if STATUS_ESTIMATED in (left, right):
+        return STATUS_ESTIMATED
+    return left if left is not None else right
+
+
+def frame_to_pairs(frame, columns):
+    
+    if frame is None or frame.empty:
+        return ()
+    return tuple(zip(*(frame[col].tolist() for col in columns)))
+
+
+def merge_pairs(left, right):
+    
+    # Counts of the same value add up, values outside one side's top list
+    # are undercounted, so the merged list is only as long as the longest input
+    counts = {}
+    for value, count in left + right:
+        counts[value] = counts.get(value, 0) + count
+    merged = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+    return tuple(merged[:max(len(left), len(right))])
+
+
+def add(left, right):
+    
+    if left is None or right is None:
+        return None
+    return left + right
+
+
+def pick(function, left, right):
+    
+    values = [value for value in (left, right) if value is not None and not pd.isna(value)]
+    return function(values) if values else None
+
+
+class ProfileResult:
+    __slots__ = ()
+    SUMMARY = ()
+    # Tabular fields are kept as tuples of rows, with the column names
+    # used when they are turned back into a DataFrame
+    PAIR_COLUMNS = {}
+
+    def __init__(self, **values):
+        for field in self.__slots__:
+            setattr(self, field, values.pop(field, None))
+        if values:
+            raise TypeError(f"Unknown fields for {type(self).__name__}: {sorted(values)}")
+        for field in self.PAIR_COLUMNS:
+            setattr(self, field, tuple(tuple(pair) for pair in getattr(self, field) or ()))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ', '.join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    @classmethod
+    def from_profiler(cls, profiler):
+        values = {}
+        for field in cls.__slots__:
+            value = getattr(profiler, field, None)
+            if field in cls.PAIR_COLUMNS:
+                value = frame_to_pairs(value, cls.PAIR_COLUMNS[field])
+            values[field] = value
+        return cls(**values)
+
+    def apply_to(self, profiler):
+        for field in self.__slots__:
+            setattr(profiler, field, self.get_frame(field) if field in self.PAIR_COLUMNS else getattr(self, field))
+
+    def get_frame(self, field):
+        return pd.DataFrame(list(getattr(self, field)), columns=list(self.PAIR_COLUMNS[field]))
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def to_json(self):
+        return json.dumps({'type': type(self).__name__, 'fields': to_jsonable(self.to_dict())})
+
+    def to_bytes(self):
+        return pickle.dumps((type(self).__name__, tuple(getattr(self, field) for field in self.__slots__)),
+                            protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def from_json(data):
+        raw = json.loads(data, object_hook=from_jsonable)
+        return RESULT_TYPES[raw['type']](**raw['fields'])
+
+    @staticmethod
+    def from_bytes(data):
+        name, values = pickle.loads(data)
+        cls = RESULT_TYPES[name]
+        return cls(**dict(zip(cls.__slots__, values)))
+
+    def get_value(self, field):
+        value = getattr(self, field)
+        if getattr(self, 'status', None) == STATUS_ESTIMATED:
+            intervals = getattr(self, 'intervals', None) or {}
+            return format_estimate(value, intervals.get(field))
+        return value
+
+    def to_frame(self):
+        summary_data = {
+            'Description': [description for _, description in self.SUMMARY],
+            'Value': ['N/A' if getattr(self, field) is None else str(self.get_value(field)) for field, _ in self.SUMMARY],
+        }
+        if 'status' in self.__slots__:
+            summary_data['Status'] = [self.status or 'N/A'] * len(self.SUMMARY)
+        return pd.DataFrame(summary_data)
+
+
+class DatasetProfile(ProfileResult):
+    __slots__ = ('n_rows', 'n_cols', 'n_duplicates', 'n_missing', 'n_num_cols', 'n_text_cols', 'columns')
+    SUMMARY = (
+        ('n_rows', 'Number of Rows'),
+        ('n_cols', 'Number of Columns'),
+        ('n_duplicates', 'Number of Duplicates'),
+        ('n_missing', 'Number of Missing Values'),
+        ('n_num_cols', 'Number of Numeric Columns'),
+        ('n_text_cols', 'Number of Text Columns'),
+    )
+    PAIR_COLUMNS = {'columns': ('Column Name', 'Data Type', 'Memory Usage')}
+
+    @classmethod
+    def from_profiler(cls, profiler):
+        values = {field: getattr(profiler, field) for field in cls.__slots__ if field != 'columns'}
+        values['columns'] = tuple(
+            (name, str(dtype), int(memory))
+            for name, dtype, memory in frame_to_pairs(profiler.table, cls.PAIR_COLUMNS['columns'])
+        )
+        return cls(**values)
+
+    def apply_to(self, profiler):
+        for field in self.__slots__:
+            if field != 'columns':
+                setattr(profiler, field, getattr(self, field))
+        profiler.cols_list = [name for name, _, _ in self.columns]
+        profiler.table = self.get_frame('columns')
+
+    def merge(self, other):
+        # Row chunks of the same file, duplicates across chunks are not seen
+        memory = dict((name, mem) for name, _, mem in other.columns)
+        return DatasetProfile(
+            n_rows=add(self.n_rows, other.n_rows),
+            n_cols=self.n_cols,
+            n_duplicates=add(self.n_duplicates, other.n_duplicates),
+            n_missing=add(self.n_missing, other.n_missing),
+            n_num_cols=self.n_num_cols,
+            n_text_cols=self.n_text_cols,
+            columns=tuple((name, dtype, mem + memory.get(name, 0)) for name, dtype, mem in self.columns),
+        )
+
+
+class ColumnProfile(ProfileResult):
+    __slots__ = ()
+    PAIR_COLUMNS = {'frequent': ('value', 'occurrence')}
+    FREQUENT_TOTAL = 'n_rows'
+
+    def get_frame(self, field):
+        frame = super().get_frame(field)
+        if field == 'frequent':
+            total = getattr(self, self.FREQUENT_TOTAL)
+            frame['percentage'] = frame['occurrence'] / total * 100 if total else np.nan
+        return frame
+
+
+class NumericProfile(ColumnProfile):
+    __slots__ = ('n_rows', 'n_unique', 'n_missing', 'col_mean', 'col_std', 'col_min', 'col_max', 'col_median',
+                 'n_zeros', 'n_negatives', 'frequent', 'status', 'intervals')
+    SUMMARY = (
+        ('n_unique', 'Number of Unique Values'),
+        ('n_missing', 'Number of Missing Values'),
+        ('col_mean', 'Average (Mean)'),
+        ('col_std', 'Standard Deviation'),
+        ('col_min', 'Minimum Value'),
+        ('col_max', 'Maximum Value'),
+        ('col_median', 'Median Value'),
+        ('n_zeros', 'Number of Zeros'),
+        ('n_negatives', 'Number of Negatives'),
+    )
+    FREQUENT_TOTAL = 'n_count'
+
+    @property
+    def n_count(self):
+        if self.n_rows is None or self.n_missing is None:
+            return None
+        return self.n_rows - self.n_missing
+
+    def merge(self, other):
+        # Mean and variance are combined with Chan's parallel update, unique
+        # counts and medians can't be recovered from two partial results
+        n_left, n_right = self.n_count or 0, other.n_count or 0
+        n_total = n_left + n_right
+        mean = std = None
+        if n_total:
+            mean_left = self.col_mean if n_left else 0.0
+            mean_right = other.col_mean if n_right else 0.0
+            delta = mean_right - mean_left
+            mean = mean_left + delta * n_right / n_total
+            m2 = ((self.col_std or 0.0) ** 2 * max(n_left - 1, 0)
+                  + (other.col_std or 0.0) ** 2 * max(n_right - 1, 0)
+                  + delta ** 2 * n_left * n_right / n_total)
+            std = math.sqrt(m2 / (n_total - 1)) if n_total > 1 else np.nan
+        return NumericProfile(
+            n_rows=add(self.n_rows, other.n_rows),
+            n_missing=add(self.n_missing, other.n_missing),
+            col_mean=mean,
+            col_std=std,
+            col_min=pick(min, self.col_min, other.col_min),
+            col_max=pick(max, self.col_max, other.col_max),
+            n_zeros=add(self.n_zeros, other.n_zeros),
+            n_negatives=add(self.n_negatives, other.n_negatives),
+            frequent=merge_pairs(self.frequent, other.frequent),
+            status=merge_status(self.status, other.status),
+            intervals={},
+        )
+
+
+class TextProfile(ColumnProfile):
+    __slots__ = ('n_rows', 'n_unique', 'n_missing', 'n_empty', 'n_mode', 'n_space', 'n_lower', 'n_upper', 'n_alpha',
+                 'n_digit', 'len_min', 'len_mean', 'len_max', 'lengths', 'frequent', 'status')
+    SUMMARY = (
+        ('n_unique', 'Number of Unique Values'),
+        ('n_missing', 'Number of Missing Values'),
+        ('n_empty', 'Number of Empty Values'),
+        ('n_mode', 'Mode'),
+        ('n_space', 'Number of Whitespace Values'),
+        ('n_lower', 'Number of Lowercase Values'),
+        ('n_upper', 'Number of Uppercase Values'),
+        ('n_alpha', 'Number of Alphabetical Values'),
+        ('n_digit', 'Number of Digit Values'),
+        ('len_min', 'Minimum Length'),
+        ('len_mean', 'Average Length'),
+        ('len_max', 'Maximum Length'),
+    )
+    PAIR_COLUMNS = {'frequent': ('value', 'occurrence'), 'lengths': ('length', 'count')}
+
+    def merge(self, other):
+        counts = {}
+        for length, count in self.lengths + other.lengths:
+            counts[length] = counts.get(length, 0) + count
+        lengths = tuple(sorted(counts.items()))
+        n_values = sum(counts.values())
+        frequent = merge_pairs(self.frequent, other.frequent)
+        return TextProfile(
+            n_rows=add(self.n_rows, other.n_rows),
+            n_missing=add(self.n_missing, other.n_missing),
+            n_empty=add(self.n_empty, other.n_empty),
+            n_mode=frequent[0][0] if frequent else None,
+            n_space=add(self.n_space, other.n_space),
+            n_lower=add(self.n_lower, other.n_lower),
+            n_upper=add(self.n_upper, other.n_upper),
+            n_alpha=add(self.n_alpha, other.n_alpha),
+            n_digit=add(self.n_digit, other.n_digit),
+            len_min=pick(min, self.len_min, other.len_min),
+            len_mean=sum(length * count for length, count in lengths) / n_values if n_values else None,
+            len_max=pick(max, self.len_max, other.len_max),
+            lengths=lengths,
+            frequent=frequent,
+            status=merge_status(self.status, other.status),
+        )
+
+
+class DateProfile(ColumnProfile):
+    __slots__ = ('n_rows', 'n_unique', 'n_missing', 'col_min', 'col_max', 'n_weekend', 'n_weekday', 'n_future',
+                 'n_empty_1900', 'n_empty_1970', 'frequent', 'status')
+    SUMMARY = (
+        ('n_unique', 'Number of Unique Values'),
+        ('n_missing', 'Number of Missing Values'),
+        ('col_min', 'Minimum Value'),
+        ('col_max', 'Maximum Value'),
+        ('n_weekend', 'Number of Weekend Dates'),
+        ('n_weekday', 'Number of Weekday Dates'),
+        ('n_future', 'Number of Future Dates'),
+        ('n_empty_1900', 'Number of Dates equal to 1900-01-01'),
+        ('n_empty_1970', 'Number of Dates equal to 1970-01-01'),
+    )
+
+    def merge(self, other):
+        return DateProfile(
+            n_rows=add(self.n_rows, other.n_rows),
+            n_missing=add(self.n_missing, other.n_missing),
+            col_min=pick(min, self.col_min, other.col_min),
+            col_max=pick(max, self.col_max, other.col_max),
+            n_weekend=add(self.n_weekend, other.n_weekend),
+            n_weekday=add(self.n_weekday, other.n_weekday),
+            n_future=add(self.n_future, other.n_future),
+            n_empty_1900=add(self.n_empty_1900, other.n_empty_1900),
+            n_empty_1970=add(self.n_empty_1970, other.n_empty_1970),
+            frequent=merge_pairs(self.frequent, other.frequent),
+            status=merge_status(self.status, other.status),
+        )
+
+
+RESULT_TYPES = {cls.__name__: cls for cls in (DatasetProfile, NumericProfile, TextProfile, DateProfile)}
@@ -0,0 +1,90 @@
+import numpy as np
+
+
+ESTIMATE_SAMPLE_SIZE = 20_000
+Z_95 = 1.96
+
+STATUS_ESTIMATED = 'estimated'
+STATUS_EXACT = 'exact'
+
+
+def sample_serie(serie, sample_size=ESTIMATE_SAMPLE_SIZE, seed=0):
+    
+    # Generator.choice without replacement only allocates sample_size
+    # positions, unlike Series.sample which permutes the whole index
+    if len(serie) <= sample_size:
+        return serie
+    positions = np.random.default_rng(seed).choice(len(serie), size=sample_size, replace=False)
+    positions.sort()
+    return serie.iloc[positions]
+
+
+def scale_counts(profiler, fields, n_total):
+    
+    factor = n_total / len(profiler.serie)
+    for field in fields:
+        value = getattr(profiler, field)
+        if value is not None:
+            setattr(profiler, field, int(round(value * factor)))
+    frequent = profiler.frequent
+    if not frequent.empty:
+        profiler.frequent = frequent.assign(occurrence=(frequent['occurrence'] * factor).round().astype(int))
+
+
+def estimate_unique(sample, n_total):
+    
+    # GEE estimator: values seen once in the sample stand for sqrt(N / n)
+    # distinct values in the full column, the others are assumed all found
+    counts = sample.value_counts(dropna=False)
+    n_distinct = len(counts)
+    if len(sample) >= n_total:
+        return n_distinct
+    singletons = int((counts == 1).sum())
+    if singletons == len(sample):
+        # Nothing repeats in the sample, the column looks like a key
+        return n_total
+    estimate = np.sqrt(n_total / len(sample)) * singletons + (n_distinct - singletons)
+    return int(round(min(max(estimate, n_distinct), n_total)))
+
+
+def mean_interval(sample):
+    
+    values = sample.dropna()
+    if len(values) < 2:
+        return None
+    half = Z_95 * values.std() / np.sqrt(len(values))
+    return values.mean() - half, values.mean() + half
+
+
+def std_interval(sample):
+    
+    values = sample.dropna()
+    if len(values) < 3:
+        return None
+    std = values.std()
+    half = Z_95 / np.sqrt(2 * (len(values) - 1))
+    return std * max(1 - half, 0), std * (1 + half)
+
+
+def median_interval(sample):
+    
+    # Distribution-free interval from the order statistics around n / 2
+    values = np.sort(sample.dropna().to_numpy())
+    n = len(values)
+    if n < 3:
+        return None
+    half = Z_95 * np.sqrt(n) / 2
+    low = max(int(np.floor(n / 2 - half)), 0)
+    high = min(int(np.ceil(n / 2 + half)), n - 1)
+    return values[low], values[high]
+
+
+def format_estimate(value, interval=None):
+    
+    if value is None:
+        return value
+    if interval is None:
+        if isinstance(value, (float, np.floating)):
+            return f"≈ {value:.6g}"
+        return f"≈ {value}"
+    return f"≈ {value:.6g} (95% CI {interval[0]:.6g} – {interval[1]:.6g})"
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.cache import file_hash
+
+
+STORE_VERSION = 1
+DEFAULT_STORE_PATH = os.path.join('csv', '.cache', 'results.sqlite')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_store = None
+_store_lock = threading.Lock()
+
+
+class ResultStore:
+    def __init__(self, path=DEFAULT_STORE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self.connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+
+    @contextmanager
+    def connect(self):
+        
+        # One short-lived connection per call keeps the store usable from
+        # any thread and any process
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(digest, column, profiler, version, params=None):
+        
+        raw = json.dumps([STORE_VERSION, digest, column, profiler, version, params], default=str, sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        
+        try:
+            with self.connect() as conn:
+                row = conn.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute('UPDATE results SET accessed = ? WHERE key = ?', (time.time(), key))
+            return pickle.loads(row[0])
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    def contains(self, key):
+        
+        try:
+            with self.connect() as conn:
+                return conn.execute('SELECT 1 FROM results WHERE key = ?', (key,)).fetchone() is not None
+        except sqlite3.Error:
+            return False
+
+    def put(self, key, value):
+        
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        if len(blob) > self.max_bytes:
+            return
+        try:
+            with self.connect() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)',
+                    (key, blob, len(blob), time.time())
+                )
+                self.evict(conn)
+        except sqlite3.Error:
+            pass
+
+    def evict(self, conn):
+        
+        # Drop the least recently used entries until the store fits again,
+        # entries written under an older version are never read and age out
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute('SELECT key, size FROM results ORDER BY accessed').fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany('DELETE FROM results WHERE key = ?', stale)
+
+    def size(self):
+        
+        with self.connect() as conn:
+            return conn.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+
+
+def get_store():
+    
+    global _store
+    with _store_lock:
+        if _store is None:
+            path = os.environ.get('CSV_EXPLORER_RESULT_STORE', DEFAULT_STORE_PATH)
+            max_bytes = int(os.environ.get('CSV_EXPLORER_RESULT_STORE_BYTES', DEFAULT_MAX_BYTES))
+            _store = ResultStore(path, max_bytes)
+        return _store
+
+
+def set_store(store):
+    
+    global _store
+    with _store_lock:
+        _store = store
+
+
+def profile_key(profiler, column, params=None):
+    
+    if profiler.file_path is None or not os.path.exists(profiler.file_path):
+        return None
+    # Every sheet of a workbook shares the file hash
+    sheet_name = getattr(profiler, 'sheet_name', None)
+    if sheet_name is not None:
+        params = dict(params or {}, sheet_name=sheet_name)
+    return ResultStore.make_key(
+        file_hash(profiler.file_path), column, type(profiler).__name__, profiler.RESULT_VERSION, params
+    )
+
+
+def has_results(profiler, column, params=None):
+    
+    key = profile_key(profiler, column, params)
+    return key is not None and get_store().contains(key)
+
+
+def load_results(profiler, column, params=None):
+    
+    key = profile_key(profiler, column, params)
+    if key is None:
+        return False
+    results = get_store().get(key)
+    if results is None:
+        return False
+    for field, value in results.items():
+        setattr(profiler, field, value)
+    return True
+
+
+def save_results(profiler, column, params=None):
+    
+    key = profile_key(profiler, column, params)
+    if key is not None:
+        get_store().put(key, {field: getattr(profiler, field) for field in profiler.RESULT_FIELDS})